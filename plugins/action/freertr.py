@@ -3,6 +3,7 @@
 
 # Copyright: Contributors to the Ansible project
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+import os
 import sys
 import copy
 
@@ -24,6 +25,12 @@ class ActionModule(ActionNetworkModule):
         """FreeRTR Ansible Run"""
 
         self._config_module = self._task.action.split('.')[-1] == 'freertr_config'
+        if self._task.action.split('.')[-1] == 'freertr_facts' and self._task.args.get('export_dir'):
+            # Export files are written on controller, relative path is relative to playbook
+            exportDir = os.path.join(self._loader.get_basedir(), os.path.expanduser(self._task.args['export_dir']))
+            exportDir = os.path.abspath(exportDir)
+            os.makedirs(exportDir, exist_ok=True)
+            self._task.args['export_dir'] = exportDir
         sockPath = None
         persConn = self._play_context.connection.split('.')[-1]
 
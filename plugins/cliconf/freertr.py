@@ -5,20 +5,79 @@
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 import re
 import json
+from collections.abc import Mapping
 
+from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils._text import to_text
 from ansible.plugins.cliconf import CliconfBase, enable_mode
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import to_list
 
 class Cliconf(CliconfBase):
 
+    def __init__(self, *args, **kwargs):
+        super(Cliconf, self).__init__(*args, **kwargs)
+        self._platform = None
+        self._device_info = None
+        self._digests = {'running': None, 'blocks': set()}
+        self._configs = {}
+        self._config_stats = {'hit': 0, 'miss': 0}
+
+    def invalidate(self, command=None):
+        """Forget running config state (and platform info, e.g. hostname)
+        kept on connection. Show commands do not change running config and keep it"""
+        if command is not None and to_text(command).startswith('show '):
+            return
+        self._digests = {'running': None, 'blocks': set()}
+        self._configs = {}
+        self._platform = None
+        self._device_info = None
+
+    @staticmethod
+    def cacheable(cmd):
+        """Check if command is running config query, which output is kept on connection"""
+        return cmd['command'].startswith('show running-config') and not cmd.get('prompt') and not cmd.get('answer')
+
+    def get_running_config(self, command='show running-config'):
+        """Get running config output (of any show running-config command).
+        It is fetched once per connection and kept until next write"""
+        if command in self._configs:
+            self._config_stats['hit'] += 1
+            return self._configs[command]
+        self._config_stats['miss'] += 1
+        out = to_text(self.send_command(command), errors='surrogate_or_strict')
+        self._configs[command] = out
+        return out
+
+    def get_config_stats(self):
+        """Get running config cache hit and miss counters"""
+        return dict(self._config_stats)
+
+    def get_config_digests(self):
+        """Get running config digest and digests of candidate blocks known
+        to be applied to it"""
+        return {'running': self._digests['running'], 'blocks': sorted(self._digests['blocks'])}
+
+    def set_config_digests(self, running, blocks):
+        """Remember candidate blocks applied to running config with digest running"""
+        if running != self._digests['running']:
+            self._digests = {'running': running, 'blocks': set()}
+        self._digests['blocks'].update(blocks)
+
+    def get_platform(self):
+        """Get show platform output. It is fetched once per connection and
+        kept until next write"""
+        if self._platform is None:
+            self._platform = to_text(self.get('show platform'), errors='surrogate_or_strict')
+        return self._platform
+
     def get_device_info(self):
         """Get Device Info"""
+        if self._device_info is not None:
+            return dict(self._device_info)
         devInfo = {}
 
         devInfo['network_os'] = 'sense.freertr.freertr'
-        reply = self.get('show platform')
-        data = to_text(reply, errors='surrogate_or_strict').strip()
+        data = self.get_platform().strip()
 
         match = re.search(r'freeRouter (\S+),', data)
         if match:
@@ -29,7 +88,8 @@ class Cliconf(CliconfBase):
         match = re.search(r'name: (\S+)', data, re.M)
         if match:
             devInfo['network_os_hostname'] = match.group(1)
-        return devInfo
+        self._device_info = devInfo
+        return dict(devInfo)
 
     @enable_mode
     def get_config(self, source='running', flags=None, format='text'):
@@ -37,23 +97,85 @@ class Cliconf(CliconfBase):
         if source not in ['running', 'startup']:
             return self.invalid_params("fetching configuration from %s is not supported" % source)
         if source == 'running':
-            cmd = 'show running-config all'
-        else:
-            cmd = 'show startup-config'
-        return self.send_command(cmd)
+            return self.get_running_config('show running-config all')
+        return self.send_command('show startup-config')
 
     @enable_mode
-    def edit_config(self, command):
-        """Edit Configuration"""
-        for cmd in ['configure terminal'] + to_list(command) + ['end']:
-            self.send_command(cmd)
+    def edit_config(self, candidate=None, commit=True, replace=None, diff=False, comment=None, stop_on_error=True):
+        """Load configuration lines in one RPC (configure terminal, lines, end).
+        Each line can be a string or a dict with command, prompt and answer.
+        Failed lines are returned in errors with their (1 based) line number,
+        loading stops at first failed line unless stop_on_error is False."""
+        if candidate is None:
+            raise ValueError("'candidate' value is required")
+
+        resp = {'request': [], 'response': [], 'errors': []}
+        self.invalidate()
+        self.send_command('configure terminal')
+        try:
+            for lineno, line in enumerate(to_list(candidate), 1):
+                if not isinstance(line, Mapping):
+                    line = {'command': line}
+                if line['command'] == 'end':
+                    continue
+                try:
+                    out = self.send_command(command=line['command'], prompt=line.get('prompt'),
+                                            answer=line.get('answer'))
+                except AnsibleConnectionFailure as ex:
+                    resp['errors'].append({'line': lineno, 'command': line['command'],
+                                           'error': getattr(ex, 'err', to_text(ex))})
+                    if stop_on_error:
+                        break
+                    continue
+                resp['request'].append(line['command'])
+                resp['response'].append(to_text(out, errors='surrogate_or_strict'))
+        finally:
+            self.send_command('end')
+        return resp
 
     def get(self, command, prompt=None, answer=None, sendonly=False, newline=True, check_all=False):
         """Get command output"""
+        self.invalidate(command)
         return self.send_command(command=command, prompt=prompt, answer=answer,
                                  sendonly=sendonly, newline=newline, check_all=check_all)
 
+    def run_commands(self, commands=None, check_rc=True, sources=False):
+        """Run a list of commands in one RPC and return all responses.
+        Each command can be a string or a dict with command, prompt, answer
+        and check_rc keys. Per command check_rc overrides the global one.
+        If sources is set, reply is a dict with responses and cached list,
+        which tells for each response if it came from running config cache."""
+        if commands is None:
+            raise ValueError("'commands' value is required")
+
+        responses = []
+        cached = []
+        for cmd in to_list(commands):
+            if not isinstance(cmd, Mapping):
+                cmd = {'command': cmd}
+            cmdCheckRc = cmd.get('check_rc')
+            if cmdCheckRc is None:
+                cmdCheckRc = check_rc
+            cached.append(self.cacheable(cmd) and cmd['command'] in self._configs)
+            try:
+                if self.cacheable(cmd):
+                    out = self.get_running_config(cmd['command'])
+                else:
+                    self.invalidate(cmd['command'])
+                    out = self.send_command(command=cmd['command'], prompt=cmd.get('prompt'),
+                                            answer=cmd.get('answer'), check_all=cmd.get('check_all', False))
+            except AnsibleConnectionFailure as ex:
+                if cmdCheckRc:
+                    raise
+                out = getattr(ex, 'err', to_text(ex))
+            responses.append(to_text(out, errors='surrogate_or_strict'))
+        if sources:
+            return {'responses': responses, 'cached': cached}
+        return responses
+
     def get_capabilities(self):
         """Get capabilities"""
         result = super(Cliconf, self).get_capabilities()
+        result['rpc'] += ['run_commands', 'get_platform', 'get_config_digests', 'set_config_digests',
+                          'get_running_config', 'get_config_stats']
         return json.dumps(result)
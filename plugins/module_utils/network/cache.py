@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Controller side cache of parsed facts.
+
+Cache is kept per device (state file in state_dir) and holds one entry per
+subset (and subset parameters). Each entry has parsed facts, list of commands
+used to build them and digest of those commands output:
+
+    * entry younger than ttl is returned as is (no commands sent);
+    * older entry is revalidated by sending same commands again (one batch) and
+      comparing output digest. Same digest reuses facts without parsing.
+
+Number of entries is bounded, least recently used entries are evicted.
+"""
+import time
+import hashlib
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.state import stateFile, loadState, saveState
+
+
+class OutputDigest:
+    """Digest of command outputs, which is updated one output at a time
+    (outputs do not need to be kept until digest is known)"""
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+
+    def update(self, output):
+        """Add next command output"""
+        self._digest.update(output.encode('utf-8', 'surrogateescape'))
+        self._digest.update(b'\0')
+
+    def hexdigest(self):
+        """Get digest of outputs added so far"""
+        return self._digest.hexdigest()
+
+
+def outputDigest(outputs):
+    """Get digest of list of command outputs"""
+    digest = OutputDigest()
+    for output in outputs:
+        digest.update(output)
+    return digest.hexdigest()
+
+
+class FactsCache:
+    """Facts cache of one device with ttl and LRU eviction"""
+
+    def __init__(self, stateDir, key, ttl, size):
+        self.fname = stateFile(stateDir, key, 'cache')
+        self.ttl = ttl
+        self.size = size
+        self.entries = loadState(self.fname).get('entries', {})
+        self.stats = {'fresh': 0, 'revalidated': 0, 'miss': 0, 'evicted': 0}
+
+    def get(self, key):
+        """Get cache entry and mark it as used"""
+        entry = self.entries.get(key)
+        if entry:
+            entry['used'] = time.time()
+        return entry
+
+    def isFresh(self, entry):
+        """Check if entry is younger than ttl"""
+        return time.time() - entry.get('created', 0) < self.ttl
+
+    def put(self, key, facts, commands, digest):
+        """Add or replace cache entry"""
+        now = time.time()
+        self.entries[key] = {'created': now, 'used': now, 'facts': facts,
+                             'commands': commands, 'digest': digest}
+
+    def touch(self, key):
+        """Entry was revalidated, start new ttl period"""
+        self.entries[key]['created'] = time.time()
+
+    def save(self):
+        """Evict least recently used entries above size and save cache"""
+        if len(self.entries) > self.size:
+            ordered = sorted(self.entries, key=lambda item: self.entries[item].get('used', 0))
+            for key in ordered[:len(self.entries) - self.size]:
+                del self.entries[key]
+                self.stats['evicted'] += 1
+        saveState(self.fname, {'entries': self.entries})
@@ -0,0 +1,252 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""FreeRTR configuration tree with path indexed blocks.
+
+FreeRTR config indents sub-commands by one space per level and closes every
+block with `exit`; `!` lines separate blocks and `end` closes configuration.
+Those lines carry no configuration and are not kept in the tree.
+
+Every line is indexed by its path (tuple of texts of its parents and itself),
+so looking up a candidate line or block in running config is a dict lookup.
+difference() returns same lines as netcommon NetworkConfig.difference for
+match line/strict/exact and replace line/block, but its cost depends on
+candidate size (and size of compared blocks), not on running config size.
+"""
+import hashlib
+
+IGNORE_LINES = frozenset(['exit', 'end'])
+COMMENT_TOKENS = ('!', '#')
+
+
+def digest(text):
+    """Return sha256 hex digest of text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ConfigLine:
+    """Single configuration line, its parents and children"""
+    __slots__ = ('text', 'raw', '_parents', '_children', 'key')
+
+    def __init__(self, raw, parents=()):
+        self.text = raw.strip()
+        self.raw = raw
+        self._parents = list(parents)
+        self._children = []
+        self.key = tuple(parent.text for parent in parents) + (self.text,)
+
+    def __str__(self):
+        return self.raw
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    @property
+    def line(self):
+        """Parents and line text joined by spaces (netcommon ConfigLine.line)"""
+        return ' '.join(self.key)
+
+    @property
+    def parents(self):
+        """Texts of parents"""
+        return list(self.key[:-1])
+
+    @property
+    def children(self):
+        """Texts of children"""
+        return [child.text for child in self._children]
+
+    @property
+    def has_parents(self):
+        return bool(self._parents)
+
+    @property
+    def has_children(self):
+        return bool(self._children)
+
+
+class FreeRTRConfig:
+    """FreeRTR configuration tree. Lines are kept in config order (items)
+    and indexed by path (index)"""
+
+    def __init__(self, contents=None, indent=1):
+        self._indent = indent
+        self.items = []
+        self.index = {}
+        if contents:
+            self.load(contents)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return '\n'.join(item.raw for item in self.items)
+
+    def _append(self, item):
+        """Add line to config order and path index (first line of a path wins)"""
+        self.items.append(item)
+        self.index.setdefault(item.key, item)
+        if item._parents:
+            item._parents[-1]._children.append(item)
+
+    def load(self, contents):
+        """Parse configuration text"""
+        ancestors = []
+        indents = []
+        for raw in contents.split('\n'):
+            raw = raw.rstrip('\r')
+            text = raw.strip()
+            if not text or text in IGNORE_LINES or text.startswith(COMMENT_TOKENS):
+                continue
+            level = len(raw) - len(raw.lstrip(' '))
+            while indents and indents[-1] >= level:
+                indents.pop()
+                ancestors.pop()
+            item = ConfigLine(raw, ancestors)
+            self._append(item)
+            ancestors.append(item)
+            indents.append(level)
+
+    def add(self, lines, parents=None):
+        """Add lines (under parents), existing lines are not added again"""
+        ancestors = []
+        for level, text in enumerate(parents or []):
+            obj = self.index.get(tuple(parent.text for parent in ancestors) + (text,))
+            if obj is None:
+                obj = ConfigLine(' ' * (level * self._indent) + text, ancestors)
+                self._append(obj)
+            ancestors.append(obj)
+        offset = ' ' * (len(ancestors) * self._indent)
+        for line in lines:
+            text = line.strip()
+            if not text or text in IGNORE_LINES or text.startswith(COMMENT_TOKENS):
+                continue
+            item = ConfigLine(offset + text, ancestors)
+            if item.key not in self.index:
+                self._append(item)
+
+    def get_object(self, path):
+        """Return line of path or None"""
+        return self.index.get(tuple(path))
+
+    def get_block(self, path):
+        """Return line of path and all its descendants"""
+        obj = self.get_object(path)
+        if obj is None:
+            raise ValueError('path does not exist in config')
+        return self.expand(obj)
+
+    @staticmethod
+    def expand(obj, out=None):
+        """Return obj and all its descendants in config order"""
+        out = [] if out is None else out
+        stack = [obj]
+        while stack:
+            item = stack.pop()
+            out.append(item)
+            stack.extend(reversed(item._children))
+        return out
+
+    def digests(self, salt=''):
+        """Return digest of every top level block (paths of block lines).
+        salt is part of every digest (e.g. diff options)"""
+        out = []
+        for item in self.items:
+            if not item._parents:
+                out.append(digest('\n'.join([salt] + ['\0'.join(obj.key) for obj in self.expand(item)])))
+        return out
+
+    def _diff_line(self, other):
+        """Lines missing in other"""
+        return [item for item in self.items if item.key not in other.index]
+
+    @staticmethod
+    def _block(other, path):
+        """Block of path in other or empty list"""
+        try:
+            return other.get_block(path)
+        except ValueError:
+            return []
+
+    def _diff_strict(self, other, path):
+        """Lines which differ from line at same position in other (block of
+        path with its parents or complete config)"""
+        lines = other.items
+        if path:
+            lines = self._block(other, path)
+            lines = (lines[0]._parents + lines) if lines else lines
+        updates = []
+        for idx, item in enumerate(self.items):
+            if idx >= len(lines) or item.text != lines[idx].text:
+                updates.append(item)
+        return updates
+
+    def _diff_exact(self, other, path):
+        """All lines if any line differs from line at same position in other
+        (block of path or complete config)"""
+        lines = self._block(other, path) if path else other.items
+        if len(lines) != len(self.items):
+            return list(self.items)
+        for ours, theirs in zip(self.items, lines):
+            if ours.key != theirs.key:
+                return list(self.items)
+        return []
+
+    def difference(self, other, match='line', path=None, replace=None):
+        """Return candidate lines (with their parents) to send, so that other
+        (running config) matches this candidate. See netcommon
+        NetworkConfig.difference for match and replace semantics"""
+        if match == 'line':
+            updates = self._diff_line(other)
+        elif match == 'strict':
+            updates = self._diff_strict(other, path)
+        elif match == 'exact':
+            updates = self._diff_exact(other, path)
+        else:
+            raise ValueError('unsupported match %s' % match)
+
+        if replace == 'block':
+            blocks = []
+            seen = set()
+            for item in updates:
+                for parent in item._parents or [item]:
+                    if parent.key not in seen:
+                        seen.add(parent.key)
+                        blocks.append(parent)
+            updates = []
+            for item in blocks:
+                self.expand(item, updates)
+
+        visited = set()
+        expanded = []
+        for item in updates:
+            addParents = False
+            if expanded:
+                last = expanded[-1]
+                if item._parents and last._parents and item.key[0] != last.key[0]:
+                    addParents = True
+                if last._children and last._children[0].text != item.text:
+                    addParents = True
+            for parent in item._parents:
+                if parent.key not in visited or addParents:
+                    visited.add(parent.key)
+                    expanded.append(parent)
+            expanded.append(item)
+            visited.add(item.key)
+        return expanded
+
+
+def dumps(objects):
+    """Return commands (line texts) of config lines"""
+    return [item.text for item in objects]
@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Streaming export of large facts into newline delimited json files.
+
+Large facts (full route tables) are written record by record into
+`<export_dir>/<device>.<fact>.ndjson` (`.ndjson.gz` if compressed), so
+neither module nor controller keep them as one json document. Facts carry
+only the manifest of written files: path, number of records and sha256 of
+file content. Files are written to a temp file and renamed when complete.
+"""
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.state import stateFile
+
+
+class HashingWriter:
+    """Binary file wrapper, which keeps sha256 of written bytes"""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self.fd.write(data)
+
+    def flush(self):
+        self.fd.flush()
+
+
+class NDJSONWriter:
+    """Write records of one fact into ndjson file"""
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.records = 0
+        dirName = os.path.dirname(path) or '.'
+        os.makedirs(dirName, exist_ok=True)
+        fd, self._tmpPath = tempfile.mkstemp(dir=dirName, prefix='.freertr-')
+        self._fd = os.fdopen(fd, 'wb')
+        self._hashing = HashingWriter(self._fd)
+        # mtime=0 keeps compressed output (and its digest) same for same records
+        self._out = gzip.GzipFile(fileobj=self._hashing, mode='wb', mtime=0) if compress else self._hashing
+        self.compress = compress
+
+    def write(self, record):
+        """Write one record"""
+        self._out.write(json.dumps(record, sort_keys=True).encode('utf-8') + b'\n')
+        self.records += 1
+
+    def writeAll(self, records):
+        """Write all records of iterable"""
+        for record in records:
+            self.write(record)
+
+    def abort(self):
+        """Drop unfinished file"""
+        self._fd.close()
+        if os.path.exists(self._tmpPath):
+            os.unlink(self._tmpPath)
+
+    def close(self):
+        """Finish file and return its manifest"""
+        try:
+            if self.compress:
+                self._out.close()
+            self._fd.close()
+            os.replace(self._tmpPath, self.path)
+        except Exception:
+            if os.path.exists(self._tmpPath):
+                os.unlink(self._tmpPath)
+            raise
+        return {'path': self.path, 'records': self.records, 'sha256': self._hashing.sha256.hexdigest(),
+                'compressed': self.compress}
+
+
+class Exports:
+    """Exported facts of one device and their manifest"""
+
+    def __init__(self, exportDir, key, compress=False):
+        self.exportDir = exportDir
+        self.key = key
+        self.compress = compress
+        self.manifest = {}
+
+    def open(self, fact):
+        """Open writer of fact"""
+        path = stateFile(self.exportDir, self.key, fact)
+        path = path[:-len('.json')] + ('.ndjson.gz' if self.compress else '.ndjson')
+        return NDJSONWriter(path, self.compress)
+
+    def write(self, fact, records):
+        """Write all records of fact and add its file to manifest"""
+        writer = self.open(fact)
+        try:
+            writer.writeAll(records)
+        except Exception:
+            writer.abort()
+            raise
+        self.manifest[fact] = writer.close()
+        return self.manifest[fact]
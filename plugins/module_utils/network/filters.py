@@ -0,0 +1,59 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Output filters pushed down to the device.
+
+FreeRTR filters command output on the device with output pipes:
+`show interfaces | include <regex>` keeps lines matching regex,
+`| exclude <regex>` drops them. Filtered output is smaller to transfer
+and to parse. One pipe is used per command, include and exclude of same
+command are combined into one include regex.
+
+apply() filters output locally same way (for devices or tests, which do
+not filter).
+"""
+import re
+
+PIPES = ('include', 'exclude')
+
+
+def anyOf(words):
+    """Regex matching any of the words (escaped)"""
+    return '(%s)' % '|'.join(re.escape(word) for word in words)
+
+
+def tableRows(header, values):
+    """Include regex of column table, which keeps header line (starting with
+    header) and rows whose first column is one of values"""
+    return '^%s\\s' % anyOf([header] + list(values))
+
+
+def pushDown(command, include=None, exclude=None):
+    """Return command with device side output filter"""
+    if include and exclude:
+        return '%s | include ^(?=.*(%s))(?!.*(%s))' % (command, include, exclude)
+    if include:
+        return '%s | include %s' % (command, include)
+    if exclude:
+        return '%s | exclude %s' % (command, exclude)
+    return command
+
+
+def splitPipe(command):
+    """Split command into (command, pipe, regex). pipe is None if command has no known filter"""
+    base, sep, pipe = command.partition(' | ')
+    name, _, regex = pipe.strip().partition(' ')
+    if not sep or name not in PIPES:
+        return command, None, None
+    return base, name, regex
+
+
+def apply(output, pipe, regex):
+    """Filter output locally (like device does)"""
+    if pipe is None:
+        return output
+    pattern = re.compile(regex)
+    keep = pipe == 'include'
+    return ''.join(line for line in output.splitlines(True) if bool(pattern.search(line)) == keep)
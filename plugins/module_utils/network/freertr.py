@@ -3,13 +3,15 @@
 
 # Copyright: Contributors to the Ansible project
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+import re
+import threading
+
 from ansible.module_utils._text import to_text
 from ansible.module_utils.basic import env_fallback
-from ansible.module_utils.connection import exec_command
+from ansible.module_utils.connection import Connection, ConnectionError
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import to_list, ComplexList
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import NetworkConfig, ConfigLine
-
-_DEVICE_CONFIGS = {}
+from ansible_collections.sense.freertr.plugins.module_utils.network.config import FreeRTRConfig
 
 WARNING_PROMPTS_RE = [
     r"[\r\n]?\[yes/no\]:\s?$",
@@ -35,6 +37,85 @@ def check_args(module, warnings):
     """Check args pass"""
     pass
 
+
+class CommandPlanner:
+    """Command planner and memo of one module run.
+    Show commands (without prompt/answer) are sent once per run, repeats are
+    served from memory. Route tables are not kept (they are large and parsed
+    once). Any other command clears memo (device state changed).
+    `show platform` is taken from connection, which fetches it once per connection."""
+
+    CONNECTION_COMMANDS = {'show platform': 'get_platform'}
+    # Show commands with large output, which is parsed once (not kept in memo)
+    UNMEMOIZED = ('show ipv4 route ', 'show ipv6 route ')
+
+    def __init__(self):
+        self.memo = {}
+        self.sent = []
+        self.stats = {'sent': 0, 'memo': 0, 'connection': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def readonly(cmd):
+        """Check if command does not change device state"""
+        return cmd['command'].startswith('show ') and not cmd.get('prompt') and not cmd.get('answer')
+
+    @classmethod
+    def memoizable(cls, cmd):
+        """Check if command output can be memoized"""
+        return cls.readonly(cmd) and not cmd['command'].startswith(cls.UNMEMOIZED)
+
+    def get(self, command):
+        """Get memoized output of command"""
+        with self._lock:
+            if command in self.memo:
+                self.stats['memo'] += 1
+                return self.memo[command]
+        return None
+
+    def plan(self, commands):
+        """Return unique commands, which output is not known yet"""
+        pending = []
+        keys = set()
+        with self._lock:
+            for cmd in commands:
+                if self.memoizable(cmd) and (cmd['command'] in self.memo or cmd['command'] in keys):
+                    self.stats['memo'] += 1
+                    continue
+                keys.add(cmd['command'])
+                pending.append(cmd)
+        return pending
+
+    def store(self, commands, responses, source='sent', cached=()):
+        """Store outputs of commands, which were sent (or taken from connection).
+        Commands in cached were answered by connection, not sent to device"""
+        with self._lock:
+            for cmd, response in zip(commands, responses):
+                cmdSource = 'connection' if cmd['command'] in cached else source
+                self.stats[cmdSource] += 1
+                if cmdSource == 'sent':
+                    self.sent.append(cmd['command'])
+                if self.memoizable(cmd):
+                    self.memo[cmd['command']] = response
+                elif not self.readonly(cmd):
+                    self.memo = {}
+
+
+def get_connection(module):
+    """Get (and keep) persistent connection of the module"""
+    if hasattr(module, '_freertr_connection'):
+        return module._freertr_connection
+    module._freertr_connection = Connection(module._socket_path)
+    return module._freertr_connection
+
+
+def get_planner(module):
+    """Get (and keep) command planner of the module run"""
+    if not hasattr(module, '_freertr_planner'):
+        module._freertr_planner = CommandPlanner()
+    return module._freertr_planner
+
+
 def get_config(module, flags=None):
     """Get running config"""
     flags = [] if flags is None else flags
@@ -42,15 +123,59 @@ def get_config(module, flags=None):
     cmd = 'show running-config ' + ' '.join(flags)
     cmd = cmd.strip()
 
+    planner = get_planner(module)
+    cfg = planner.get(cmd)
+    if cfg is None:
+        try:
+            cfg = _send(module, planner, [{'command': cmd}])[0]
+        except ConnectionError as ex:
+            module.fail_json(msg='unable to retrieve current config', stderr=to_text(ex, errors='surrogate_then_replace'))
+    return to_text(cfg, errors='surrogate_or_strict').strip()
+
+
+def get_section_config(module, parents):
+    """Get running config of parents[0] block only (show running-config | section).
+    Block is matched exactly (filter is a regex and can match more blocks).
+    Returns empty config if block does not exist and None if command failed or
+    device did not filter config (output has top level lines not matching the
+    filter), caller then falls back to full get_config"""
+    cmd = 'show running-config | section %s' % parents[0]
+    planner = get_planner(module)
+    cfg = planner.get(cmd)
+    if cfg is None:
+        try:
+            cfg = _send(module, planner, [{'command': cmd}])[0]
+        except ConnectionError:
+            return None
+    section = FreeRTRConfig(to_text(cfg, errors='surrogate_or_strict').strip())
+    try:
+        header = re.compile(parents[0])
+    except re.error:
+        header = re.compile(re.escape(parents[0]))
+    if any(not item.has_parents and not header.search(item.line) for item in section.items):
+        return None
     try:
-        return _DEVICE_CONFIGS[cmd]
-    except KeyError:
-        ret, out, err = exec_command(module, cmd)
-        if ret != 0:
-            module.fail_json(msg='unable to retrieve current config', stderr=to_text(err, errors='surrogate_or_strict'))
-        cfg = to_text(out, errors='surrogate_or_strict').strip()
-        _DEVICE_CONFIGS[cmd] = cfg
-        return cfg
+        block = section.get_block(parents[:1])
+    except ValueError:
+        return ''
+    return '\n'.join(item.raw for item in block)
+
+
+def get_config_digests(module):
+    """Get config digests kept on connection (see cliconf get_config_digests).
+    None if connection does not keep them"""
+    try:
+        return get_connection(module).get_config_digests()
+    except ConnectionError:
+        return None
+
+
+def set_config_digests(module, running, blocks):
+    """Remember candidate block digests applied to running config on connection"""
+    try:
+        get_connection(module).set_config_digests(running, blocks)
+    except ConnectionError:
+        pass
 
 
 def to_commands(module, commands):
@@ -58,39 +183,85 @@ def to_commands(module, commands):
     spec = {
         'command': {'key': True},
         'prompt': {},
-        'answer': {}
+        'answer': {},
+        'check_rc': {}
     }
     transform = ComplexList(spec, module)
     return transform(commands)
 
 
-def run_commands(module, commands, check_rc=True):
-    """Run Commands"""
-    responses = []
-    commands = to_commands(module, to_list(commands))
-    for cmd in commands:
-        cmd = module.jsonify(cmd)
-        ret, out, err = exec_command(module, cmd)
-        if check_rc and ret != 0:
-            module.fail_json(msg=to_text(err, errors='surrogate_or_strict'), rc=ret)
-        responses.append(to_text(out, errors='surrogate_or_strict'))
+def _from_connection(module, planner, pending):
+    """Take outputs known by connection (e.g. show platform) from it"""
+    out = []
+    for cmd in pending:
+        method = planner.CONNECTION_COMMANDS.get(cmd['command'])
+        if not method or not planner.memoizable(cmd):
+            out.append(cmd)
+            continue
+        try:
+            response = getattr(get_connection(module), method)()
+        except ConnectionError:
+            out.append(cmd)
+            continue
+        planner.store([cmd], [response], source='connection')
+    return out
+
+
+def _send(module, planner, pending, check_rc=True):
+    """Send commands in one RPC and store their outputs. Running config
+    answered from connection cache (cliconf reports it in same reply) is not
+    counted as sent. Raises ConnectionError"""
+    connection = get_connection(module)
+    if not any(cmd['command'].startswith('show running-config') for cmd in pending):
+        responses = connection.run_commands(commands=pending, check_rc=check_rc)
+        planner.store(pending, responses)
+        return responses
+    reply = connection.run_commands(commands=pending, check_rc=check_rc, sources=True)
+    responses = reply['responses']
+    cached = set(cmd['command'] for cmd, hit in zip(pending, reply['cached']) if hit)
+    planner.store(pending, responses, cached=cached)
     return responses
 
 
-def load_config(module, commands):
-    """Load config"""
-    ret, _out, err = exec_command(module, 'configure terminal')
-    if ret != 0:
-        module.fail_json(msg='unable to enter configuration mode', err=to_text(err, errors='surrogate_or_strict'))
+def run_commands(module, commands, check_rc=True, memoize=False):
+    """Run Commands. All commands are sent in one batched RPC.
+    If memoize is set, show commands already run in this module run
+    are not sent again (see CommandPlanner)"""
+    commands = to_commands(module, to_list(commands))
+    planner = get_planner(module)
+    pending = planner.plan(commands) if memoize else commands
+    known = {}
+    if memoize:
+        pending = _from_connection(module, planner, pending)
+        # Memo hits are taken before pending commands are sent (they can clear memo)
+        with planner._lock:
+            known = dict((cmd['command'], planner.memo[cmd['command']]) for cmd in commands
+                         if cmd['command'] in planner.memo)
+    responses = []
+    if pending:
+        try:
+            responses = _send(module, planner, pending, check_rc=check_rc)
+        except ConnectionError as ex:
+            module.fail_json(msg=to_text(ex, errors='surrogate_then_replace'), rc=getattr(ex, 'code', 1))
+    if not memoize:
+        return responses
+    known.update((cmd['command'], response) for cmd, response in zip(pending, responses))
+    return [known[cmd['command']] for cmd in commands]
 
-    for command in to_list(commands):
-        if command == 'end':
-            continue
-        ret, _out, err = exec_command(module, command)
-        if ret != 0:
-            module.fail_json(msg=to_text(err, errors='surrogate_or_strict'), command=command, rc=ret)
 
-    exec_command(module, 'end')
+def load_config(module, commands):
+    """Load config lines in one RPC. Lines can be strings or dicts with
+    command, prompt and answer. Fails with all per line errors"""
+    get_planner(module).memo = {}
+    connection = get_connection(module)
+    try:
+        resp = connection.edit_config(candidate=to_list(commands))
+    except ConnectionError as ex:
+        module.fail_json(msg='unable to load configuration', err=to_text(ex, errors='surrogate_then_replace'))
+    if resp.get('errors'):
+        msg = '; '.join(['line %s (%s): %s' % (item['line'], item['command'], item['error']) for item in resp['errors']])
+        module.fail_json(msg='unable to load configuration: %s' % msg, errors=resp['errors'])
+    return resp
 
 
 def get_sublevel_config(running_config, module):
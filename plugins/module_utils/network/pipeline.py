@@ -0,0 +1,56 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Pipelined execution: caller thread does device I/O, worker thread parses.
+
+While worker parses output of previous batch, caller thread already waits for
+next batch over the persistent connection, so total time is close to
+max(I/O, CPU) instead of their sum. Worker runs jobs in submit order.
+Any exception (including SystemExit from fail_json) raised in worker is
+re-raised in caller thread by close().
+"""
+import sys
+import queue
+import threading
+
+
+class Pipeline:
+    """Single worker pipeline"""
+
+    def __init__(self, depth=2):
+        self._jobs = queue.Queue(maxsize=depth)
+        self._error = None
+        self._worker = threading.Thread(target=self._work, name='freertr-parser')
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _work(self):
+        """Worker loop. After first failure remaining jobs are skipped"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                job()
+            except BaseException:  # pylint: disable=broad-except
+                self._error = sys.exc_info()
+
+    def submit(self, job):
+        """Submit callable to worker. Blocks if worker is `depth` jobs behind"""
+        if self._error is not None:
+            self.close()
+        self._jobs.put(job)
+
+    def close(self):
+        """Wait for all jobs and re-raise worker failure"""
+        if self._worker.is_alive():
+            self._jobs.put(None)
+            self._worker.join()
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error[1].with_traceback(error[2])
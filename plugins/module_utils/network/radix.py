@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Path compressed binary radix (Patricia) trie for longest prefix match.
+
+Trie nodes are kept in parallel arrays (node index is position):
+
+    lens    array('B')  prefix length of node
+    keys    list        network address of node (int, host bits zero)
+    left    array('i')  child node with next bit 0 (-1 none)
+    right   array('i')  child node with next bit 1 (-1 none)
+    values  array('i')  value of node prefix, e.g. RouteTable route index
+                        (-1 for branch nodes, which have no prefix)
+
+Node 0 is the root (length 0). Every node has a prefix or two children, so
+a trie of N prefixes has less than 2N nodes. Prefixes are sorted first and
+trie is built in one pass over them (sorted prefixes are only added on the
+rightmost path), lookups walk at most one node per prefix length.
+"""
+import sys
+import socket
+from array import array
+
+FAMILIES = {'ipv4': (socket.AF_INET, 32), 'ipv6': (socket.AF_INET6, 128)}
+
+
+def parsePrefix(text):
+    """Parse address or prefix (10.0.0.1, 10.0.0.0/8, 2001:db8::/32).
+    Returns (iptype, network int, prefix length), host bits are cleared.
+    Raises ValueError if text is not valid"""
+    network, _, masklen = text.strip().partition('/')
+    iptype = 'ipv6' if ':' in network else 'ipv4'
+    family, width = FAMILIES[iptype]
+    try:
+        key = int.from_bytes(socket.inet_pton(family, network), 'big')
+        masklen = int(masklen) if masklen else width
+    except (OSError, ValueError):
+        raise ValueError('bad prefix %s' % text)
+    if not 0 <= masklen <= width:
+        raise ValueError('bad prefix length %s' % text)
+    return iptype, key >> (width - masklen) << (width - masklen) if masklen else 0, masklen
+
+
+class RadixTrie:
+    """Longest prefix match trie of one address family"""
+
+    def __init__(self, width=32):
+        self.width = width
+        self.lens = array('B', [0])
+        self.keys = [0]
+        self.left = array('i', [-1])
+        self.right = array('i', [-1])
+        self.values = array('i', [-1])
+
+    def __len__(self):
+        return len(self.lens)
+
+    def _node(self, key, length, value):
+        """Add node and return its index"""
+        self.lens.append(length)
+        self.keys.append(key)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.values.append(value)
+        return len(self.lens) - 1
+
+    def _bit(self, key, pos):
+        """Bit of key at position pos (0 is most significant)"""
+        return (key >> (self.width - 1 - pos)) & 1
+
+    def _contains(self, node, key, length):
+        """Check if node prefix contains prefix key/length"""
+        nlen = self.lens[node]
+        shift = self.width - nlen
+        return nlen <= length and (key >> shift) == (self.keys[node] >> shift)
+
+    def _setChild(self, parent, bit, child):
+        if bit:
+            self.right[parent] = child
+        else:
+            self.left[parent] = child
+
+    def build(self, prefixes):
+        """Build trie from (key, length, value) items. If prefix repeats,
+        lowest value is kept"""
+        width = self.width
+        masked = []
+        for key, length, value in prefixes:
+            shift = width - length
+            masked.append((key >> shift << shift, length, value))
+        masked.sort()
+        stack = [0]
+        for key, length, value in masked:
+            popped = -1
+            while not self._contains(stack[-1], key, length):
+                popped = stack.pop()
+            top = stack[-1]
+            if self.lens[top] == length:
+                if self.values[top] == -1:
+                    self.values[top] = value
+                continue
+            new = self._node(key, length, value)
+            if popped != -1:
+                diff = key ^ self.keys[popped]
+                common = min(width - diff.bit_length(), length, self.lens[popped])
+                if common > self.lens[top]:
+                    # Branch at first differing bit, popped subtree goes left
+                    shift = width - common
+                    branch = self._node(key >> shift << shift if common else 0, common, -1)
+                    self._setChild(top, self._bit(key, self.lens[top]), branch)
+                    self._setChild(branch, self._bit(self.keys[popped], common), popped)
+                    self._setChild(branch, self._bit(key, common), new)
+                    stack.append(branch)
+                    stack.append(new)
+                    continue
+            self._setChild(top, self._bit(key, self.lens[top]), new)
+            stack.append(new)
+        return self
+
+    def lookup(self, key, length=None):
+        """Return value of longest prefix containing key/length (-1 if none)"""
+        length = self.width if length is None else length
+        best = -1
+        node = 0
+        width = self.width
+        lens, keys, values = self.lens, self.keys, self.values
+        while node != -1:
+            nlen = lens[node]
+            if nlen > length or (key >> (width - nlen)) != (keys[node] >> (width - nlen)):
+                break
+            if values[node] != -1:
+                best = values[node]
+            if nlen == width:
+                break
+            node = self.right[node] if (key >> (width - 1 - nlen)) & 1 else self.left[node]
+        return best
+
+    def nbytes(self):
+        """Approximate memory used by nodes: array buffers, keys list and key ints"""
+        return sum(col.itemsize * len(col) for col in [self.lens, self.left, self.right, self.values]) + \
+            sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+
+    @classmethod
+    def fromTable(cls, table):
+        """Build trie of RouteTable, values are route indexes"""
+        width = table.width * 8
+        masks = table.masks
+
+        def prefixes():
+            for idx in range(len(table)):
+                yield table.network(idx), masks[idx], idx
+        return cls(width).build(prefixes())
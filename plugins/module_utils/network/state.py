@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Controller side state files of freertr modules.
+
+Network modules run on the controller, so state between runs (counter
+samples, caches, snapshots) is kept in json files inside module `state_dir`.
+Each device has own files (named by hostname and hwid), so parallel forks
+working on different devices never write to the same file.
+"""
+import os
+import json
+import tempfile
+
+
+def deviceKey(hostname, hwid):
+    """Get device key from hostname and hwid"""
+    return "%s_%s" % (hostname or 'unknown', hwid or 'unknown')
+
+
+def stateFile(stateDir, key, kind):
+    """Get state file path for device key and state kind"""
+    safeKey = "".join([char if char.isalnum() or char in '-_.' else '_' for char in key])
+    return os.path.join(stateDir, "%s.%s.json" % (safeKey, kind))
+
+
+def loadState(path):
+    """Load json state file. Missing or broken file is an empty state"""
+    try:
+        with open(path, 'r', encoding='utf-8') as fd:
+            data = json.load(fd)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return data
+
+
+def saveState(path, data):
+    """Write json state file atomically (temp file and rename)"""
+    dirName = os.path.dirname(path) or '.'
+    os.makedirs(dirName, exist_ok=True)
+    fd, tmpPath = tempfile.mkstemp(dir=dirName, prefix='.freertr-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fdw:
+            json.dump(data, fdw)
+        os.replace(tmpPath, path)
+    except Exception:
+        if os.path.exists(tmpPath):
+            os.unlink(tmpPath)
+        raise
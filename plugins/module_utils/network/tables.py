@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Column aligned table parser for FreeRTR show output.
+
+FreeRTR prints tables with every column left aligned under its header name.
+Table reads column offsets from the header once and uses them for rows with
+empty cells, so those cells keep their position. Tables with grouped columns (e.g. show
+vrf routing) have more header rows, upper rows name the column groups:
+
+               ifc     uni
+    name  rd   v4  v6  v4  v6
+    lin   0:0  1   0   2   0
+
+Rows are yielded lazily while walking the output. A row with one value per
+column is split on whitespace (str.split runs in C and is faster than slicing
+every cell in Python), so rows, which are not aligned to the header, are
+still parsed. A row with less values has empty cells and is sliced at column
+offsets if every value starts at its column offset, otherwise it is skipped.
+Row with more values is sliced the same way, last cell keeps its spaces.
+"""
+from operator import itemgetter
+
+
+def iterLines(data):
+    """Yield lines of data one by one without building a list of all lines"""
+    start = 0
+    dataLen = len(data)
+    while start < dataLen:
+        end = data.find('\n', start)
+        if end == -1:
+            end = dataLen
+        yield data[start:end]
+        start = end + 1
+
+
+def headerWords(line):
+    """Return (offset, word) of every word in header line"""
+    out = []
+    start = None
+    for idx, char in enumerate(line):
+        if char == ' ':
+            if start is not None:
+                out.append((start, line[start:idx]))
+                start = None
+        elif start is None:
+            start = idx
+    if start is not None:
+        out.append((start, line[start:]))
+    return out
+
+
+class Table:
+    """Column aligned table. Header rows are read on creation, rows on iteration"""
+
+    def __init__(self, data, headers=1):
+        self.lines = iterLines(data)
+        self.columns = []
+        self.groups = []
+        self.spans = []
+        self.skipped = 0
+        rows = []
+        for line in self.lines:
+            if line and not line.isspace():
+                rows.append(line.rstrip())
+                if len(rows) == headers:
+                    break
+        if len(rows) < headers:
+            return
+        words = headerWords(rows[-1])
+        offsets = [offset for offset, _ in words]
+        self.columns = [word for _, word in words]
+        self.spans = list(zip(offsets, offsets[1:] + [None]))
+        self.groups = [() for _ in words]
+        for row in rows[:-1]:
+            groups = headerWords(row)
+            for idx, offset in enumerate(offsets):
+                name = None
+                for start, word in groups:
+                    if start > offset:
+                        break
+                    name = word
+                if name is not None:
+                    self.groups[idx] += (name,)
+
+    def index(self, name, group=None):
+        """Return index of column name (inside group for grouped columns)"""
+        for idx, column in enumerate(self.columns):
+            if column == name and (group is None or group in self.groups[idx]):
+                return idx
+        raise KeyError(name)
+
+    def aligned(self, line):
+        """Check if every cell of line starts at its column offset (or is empty)"""
+        lineLen = len(line)
+        for start, end in self.spans:
+            if start >= lineLen:
+                return True
+            if (start and line[start - 1] != ' ') or (line[start] == ' ' and not line[start:end].isspace()):
+                return False
+        return True
+
+    def rows(self, indexes=None):
+        """Yield tuples of cell values, all columns or only selected indexes"""
+        if not self.columns:
+            return
+        width = len(self.columns)
+        indexes = list(range(width)) if indexes is None else list(indexes)
+        select = itemgetter(*indexes) if len(indexes) > 1 else lambda values: (values[indexes[0]],)
+        spans = [self.spans[idx] for idx in indexes]
+        for line in self.lines:
+            values = line.split()
+            if len(values) == width:
+                # Every cell has a value, split (in C) is faster than slicing
+                yield select(values)
+            elif not values:
+                continue
+            elif self.aligned(line):
+                # Empty cells, take values at column offsets
+                yield tuple(line[start:end].strip() for start, end in spans)
+            else:
+                self.skipped += 1
+
+    def __iter__(self):
+        return self.rows()
+
+    def records(self):
+        """Yield rows as dicts keyed by column name (not usable for grouped columns)"""
+        for row in self.rows():
+            yield dict(zip(self.columns, row))
@@ -4,12 +4,15 @@
 # Copyright: Contributors to the Ansible project
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
+import re
 import time
+import random
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.six import string_types
 from ansible.utils.display import Display
 from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import run_commands
 from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import freertr_argument_spec, check_args
+from ansible_collections.sense.freertr.plugins.module_utils.network.filters import pushDown
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import ComplexList
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.parsing import Conditional
 
@@ -30,9 +33,34 @@ def parse_commands(module, warnings):
             warnings.append('only show commands are supported when using check mode, not executing `%s`' % item['command'])
         elif item['command'].startswith('conf'):
             module.fail_json(msg='freertr_command does not support running config mode commands.  Please use freertr_config instead')
+    filters = module.params['filters'] or {}
+    for item in commands:
+        # Show commands without own output pipe are filtered on device
+        if item['command'].startswith('show ') and ' | ' not in item['command']:
+            item['command'] = pushDown(item['command'], filters.get('include'), filters.get('exclude'))
     return commands
 
 
+def conditionalIndexes(item, count):
+    """Return indexes of commands, which output conditional refers to (result[N]).
+    Conditional without index refers to all commands"""
+    match = re.match(r'result\[(\d+)\]', item.key)
+    if match and int(match.group(1)) < count:
+        return set([int(match.group(1))])
+    return set(range(count))
+
+
+def pollDelays(interval, backoff, jitter, maxInterval=None):
+    """Yield sleep times between polls: interval multiplied by backoff after
+    every poll (up to maxInterval), randomized by +-jitter fraction"""
+    delay = float(interval)
+    while True:
+        yield max(0.0, delay * (1 + random.uniform(-jitter, jitter)))
+        delay *= backoff
+        if maxInterval:
+            delay = min(delay, maxInterval)
+
+
 def main():
     """main entry point for module execution
     """
@@ -42,7 +70,12 @@ def main():
         'wait_for': {'type':'list', 'elements': 'str'},
         'match': {'default':'all', 'choices': ['all', 'any']},
         'retries': {'default':10, 'type': 'int'},
-        'interval': {'default': 1, 'type': 'int'}}
+        'interval': {'default': 1, 'type': 'int'},
+        'backoff': {'default': 1.0, 'type': 'float'},
+        'jitter': {'default': 0.0, 'type': 'float'},
+        'max_interval': {'type': 'float'},
+        'deadline': {'type': 'float'},
+        'filters': {'type': 'dict', 'options': {'include': {'type': 'str'}, 'exclude': {'type': 'str'}}}}
 
     argument_spec.update(freertr_argument_spec)
 
@@ -60,33 +93,45 @@ def main():
     conditionals = [Conditional(c) for c in wait_for]
 
     retries = module.params['retries']
-    interval = module.params['interval']
     match = module.params['match']
+    delays = pollDelays(module.params['interval'], module.params['backoff'], module.params['jitter'],
+                        module.params['max_interval'])
+    deadline = time.time() + module.params['deadline'] if module.params['deadline'] else None
+    polls = dict((item.raw, 0) for item in conditionals)
 
+    responses = [None] * len(commands)
+    pending = list(range(len(commands)))
     while retries > 0:
-        responses = run_commands(module, commands)
+        # Only commands of unmet conditionals are sent again
+        for idx, response in zip(pending, run_commands(module, [commands[idx] for idx in pending])):
+            responses[idx] = response
 
-        for item in conditionals:
+        for item in list(conditionals):
+            polls[item.raw] += 1
             if item(responses):
                 if match == 'any':
                     conditionals = []
                     break
                 conditionals.remove(item)
 
-        if not conditionals:
-            break
-
-        time.sleep(interval)
         retries -= 1
+        if not conditionals or retries <= 0:
+            break
+        delay = next(delays)
+        if deadline is not None and time.time() + delay > deadline:
+            break
+        time.sleep(delay)
+        pending = sorted(set().union(*[conditionalIndexes(item, len(commands)) for item in conditionals]))
 
     if conditionals:
         failed_conditions = [item.raw for item in conditionals]
         msg = 'One or more conditional statements have not been satisfied'
-        module.fail_json(msg=msg, failed_conditions=failed_conditions)
+        module.fail_json(msg=msg, failed_conditions=failed_conditions, polls=polls)
 
     result.update({
         'changed': False,
         'stdout': responses,
+        'polls': polls,
         'stdout_lines': list(toLines(responses))
     })
 
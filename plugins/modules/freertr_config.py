@@ -16,17 +16,18 @@ EXAMPLES = ""
 RETURN = ""
 from ansible.module_utils.basic import AnsibleModule
 from ansible.utils.display import Display
-from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import get_config
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import get_config, get_section_config
 from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import freertr_argument_spec, check_args
 from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import load_config, run_commands
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import NetworkConfig, dumps
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import get_config_digests, set_config_digests
+from ansible_collections.sense.freertr.plugins.module_utils.network.config import FreeRTRConfig, dumps, digest
 
 
 display = Display()
 
 
 def get_candidate(module):
-    candidate = NetworkConfig(indent=1)
+    candidate = FreeRTRConfig()
     if module.params['src']:
         candidate.load(module.params['src'])
     elif module.params['lines']:
@@ -43,9 +44,14 @@ def get_candidate(module):
 
 def get_running_config(module):
     contents = module.params['config']
-    if not contents:
-        contents = get_config(module)
-    return contents
+    if contents:
+        return contents
+    if module.params['parents']:
+        # Only parent block is needed for the diff
+        contents = get_section_config(module, module.params['parents'])
+        if contents is not None:
+            return contents
+    return get_config(module)
 
 
 def main():
@@ -69,6 +75,7 @@ def main():
         update=dict(choices=['merge', 'check'], default='merge'),
         save=dict(type='bool', default=False),
         config=dict(),
+        digest=dict(type='bool', default=False),
         backup=dict(type='bool', default=False),
         backup_options=dict(type='dict', options=backup_spec)
     )
@@ -99,25 +106,33 @@ def main():
     commands = list()
 
     if any((module.params['lines'], module.params['src'])):
-        if match != 'none':
-            config = get_running_config(module)
-            config = NetworkConfig(contents=config, indent=1)
-            configobjs = candidate.difference(config, match=match, replace=replace)
+        blocks = None
+        known = None
+        if match != 'none' and module.params['digest'] and module.params['src']:
+            # Blocks applied since last write on this connection need no diff
+            blocks = candidate.digests('%s %s' % (match, replace))
+            known = get_config_digests(module)
+        if known and set(blocks).issubset(known['blocks']):
+            configobjs = []
+            result['digest'] = 'unchanged'
+        elif match != 'none':
+            contents = get_running_config(module)
+            config = FreeRTRConfig(contents)
+            configobjs = candidate.difference(config, match=match, path=parents, replace=replace)
+            if blocks is not None and not configobjs:
+                set_config_digests(module, digest(contents), blocks)
         else:
             configobjs = candidate.items
 
         if configobjs:
-            commands = dumps(configobjs, 'commands')
+            commands = dumps(configobjs)
             if ((isinstance(module.params['lines'], list)) and
                     (isinstance(module.params['lines'][0], dict)) and
                     set(['prompt', 'answer']).issubset(module.params['lines'][0])):
-
-                cmd = {'command': commands,
-                       'prompt': module.params['lines'][0]['prompt'],
-                       'answer': module.params['lines'][0]['answer']}
-                commands = [module.jsonify(cmd)]
-            else:
-                commands = commands.split('\n')
+                # Prompt can follow any of the lines, all of them are loaded in one RPC
+                commands = [{'command': command,
+                             'prompt': module.params['lines'][0]['prompt'],
+                             'answer': module.params['lines'][0]['answer']} for command in commands]
 
             if module.params['before']:
                 commands[:0] = module.params['before']
@@ -4,34 +4,146 @@
 # Copyright: Contributors to the Ansible project
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 import re
+import json
+import fnmatch
+import itertools
+import functools
+import time
+import hashlib
 import traceback
 from netaddr import IPAddress
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.six import iteritems
 from ansible.utils.display import Display
-from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import run_commands
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import run_commands, get_planner
 from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import freertr_argument_spec, check_args
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable, RouteFilter
+from ansible_collections.sense.freertr.plugins.module_utils.network.tables import Table
+from ansible_collections.sense.freertr.plugins.module_utils.network.filters import pushDown, tableRows, splitPipe
+from ansible_collections.sense.freertr.plugins.module_utils.network.state import deviceKey, stateFile, loadState, saveState
+from ansible_collections.sense.freertr.plugins.module_utils.network.cache import FactsCache, OutputDigest
+from ansible_collections.sense.freertr.plugins.module_utils.network.pipeline import Pipeline
+from ansible_collections.sense.freertr.plugins.module_utils.network.export import Exports
 
 display = Display()
 
 
+INTERFACE_FIELDS = ['operstatus', 'description', 'macaddress', 'mtu', 'bandwidth', 'tagged', 'ipv4', 'ipv6']
+
+
+def nameMatcher(patterns):
+    """Compile name patterns into one regex. Pattern is a glob (sdn*) or
+    a regex with re: prefix (re:sdn\\d+$), regex must match from start"""
+    regexes = [item[3:] if item.startswith('re:') else fnmatch.translate(item) for item in patterns]
+    return re.compile('|'.join('(?:%s)' % item for item in regexes))
+
+
+def nameSelector(include=None, exclude=None):
+    """Return function, which checks if name is included and not excluded.
+    None if there are no patterns (all names selected)"""
+    if not include and not exclude:
+        return None
+    includeRe = nameMatcher(include) if include else None
+    excludeRe = nameMatcher(exclude) if exclude else None
+    known = {}
+
+    def select(name):
+        if name not in known:
+            known[name] = bool((includeRe is None or includeRe.match(name)) and
+                               (excludeRe is None or not excludeRe.match(name)))
+        return known[name]
+    return select
+
+
 class FactsBase:
     """Base class for Facts"""
 
     COMMANDS = []
+    # Can parsed facts be reused from facts cache
+    CACHEABLE = True
+    # Facts, which are streamed to export files in export mode
+    EXPORTS = []
+    # show interfaces lines used by the subset (filter push-down)
+    INTERFACES_LINES = None
 
     def __init__(self, module):
         self.module = module
         self.facts = {}
         self.responses = None
+        # Known command outputs (e.g. from cache revalidation), ordered
+        # list of commands, which facts were built from, and their output digest.
+        # Large outputs are dropped from replies once parsed
+        self.replies = {}
+        self.used = []
+        self.digest = OutputDigest()
+        # Exports of device (export_dir), None if facts are returned
+        self.exports = None
+        # Names of all subsets gathered in this run
+        self.subsets = set()
 
     def populate(self):
         """Populate responses"""
-        self.responses = run_commands(self.module, self.COMMANDS, check_rc=False)
+        self.responses = self.run(self.getCommands())
+
+    def steps(self):
+        """Yield (commands, parse) steps of the subset. Caller runs commands,
+        calls parse(outputs) and sends outputs back to the generator. Code
+        between steps runs in caller thread and must only prepare next
+        commands, parse can run in pipeline worker (or be None).
+        Subset is one step parsed by populate by default"""
+        yield self.getCommands(), lambda outputs: self.populate()
+
+    def gather(self, submit=None):
+        """Run steps of the subset. Parse jobs are run here or passed to
+        submit (pipeline), so next step is fetched while previous is parsed"""
+        steps = self.steps()
+        outputs = None
+        while True:
+            try:
+                commands, parse = steps.send(outputs)
+            except StopIteration:
+                return
+            outputs = self.run(commands) if commands else []
+            if parse is None:
+                continue
+            job = functools.partial(parse, outputs)
+            if submit is None:
+                job()
+            else:
+                submit(job)
+
+    def getCommands(self):
+        """Commands of the subset"""
+        return self.COMMANDS
+
+    def filtered(self, command, include=None, exclude=None):
+        """Command with device side output filter, if filter push-down is enabled"""
+        if not self.module.params.get('pushdown'):
+            return command
+        return pushDown(command, include, exclude)
+
+    def showInterfaces(self):
+        """show interfaces filtered to lines used by this and all other subsets
+        of the run, which parse it, so its output is fetched once for all of them"""
+        lines = []
+        for subset in [FACT_SUBSETS[name] for name in sorted(self.subsets)] + [type(self)]:
+            if subset.INTERFACES_LINES and subset.INTERFACES_LINES not in lines:
+                lines.append(subset.INTERFACES_LINES)
+        return self.filtered('show interfaces', include=r'^\S|^ (%s)' % '|'.join(lines))
 
     def run(self, cmd):
-        """Run commands"""
-        return run_commands(self.module, cmd, check_rc=False)
+        """Run commands. Commands with known output (in this subset or
+        in any other subset of this run) are not sent again"""
+        cmds = cmd if isinstance(cmd, list) else [cmd]
+        missing = [item for item in cmds if item not in self.replies]
+        if missing:
+            for item, output in zip(missing, run_commands(self.module, missing, check_rc=False, memoize=True)):
+                self.replies[item] = output
+        for item in cmds:
+            if item not in self.used:
+                self.used.append(item)
+                self.digest.update(self.replies[item])
+        return [self.replies[item] for item in cmds]
 
 
 class Default(FactsBase):
@@ -90,48 +202,122 @@ class Interfaces(FactsBase):
                 'show ipv6 interface',
                 'show lldp neighbor']
 
+    # show interfaces line kinds, keyed by first 3 chars after indent
+    LINE_KINDS = {'des': 'description', 'typ': 'type', 'ipv': 'address',
+                  'rec': 'counters', 'tra': 'counters'}
+    TYPE_RE = re.compile(r'\b(type|hwaddr|mtu|bw|vrf)(?: is |=)([^ ,]+)')
+    # show interfaces lines used by interfaces facts (counters are not)
+    INTERFACES_LINES = 'description|type|ipv4 address|ipv6 address'
+
+    # Commands needed only for some interface fields
+    COMMAND_FIELDS = {'show ipv4 interface': 'ipv4', 'show ipv6 interface': 'ipv6'}
+
+    def __init__(self, module):
+        super(Interfaces, self).__init__(module)
+        params = module.params if module else {}
+        self.fields = set(params.get('interfaces_fields') or INTERFACE_FIELDS)
+        self.select = None
+        # Lookup indexes (interfaces_indexes), built while facts are parsed
+        self.indexes = None
+        try:
+            self.select = nameSelector(params.get('interfaces_include'), params.get('interfaces_exclude'))
+        except re.error as ex:
+            module.fail_json(msg='Bad interfaces_include/interfaces_exclude value: %s' % ex)
+
+    def getCommands(self):
+        """Commands of the subset, show interfaces is filtered to used lines.
+        Address commands of fields, which are not selected, are not sent"""
+        out = []
+        for cmd in self.COMMANDS:
+            if cmd in self.COMMAND_FIELDS and self.COMMAND_FIELDS[cmd] not in self.fields:
+                continue
+            out.append(self.showInterfaces() if cmd == 'show interfaces' else cmd)
+        return out
+
     def populate(self):
-        super(Interfaces, self).populate()
+        self.gather()
+
+    def steps(self):
+        commands = self.getCommands()
+        if self.module.params.get('interfaces_indexes'):
+            self.indexes = {'mac': {}, 'ip': {}, 'parent': {}, 'chassis': {}}
+            self.facts['indexes'] = self.indexes
+        outputs = yield commands, functools.partial(self.parseOutputs, commands)
+        outputs = dict((splitPipe(cmd)[0], output) for cmd, output in zip(commands, outputs))
+        # Neighbor table is small, it is parsed here to fetch details while interfaces are parsed
+        neighbors = self.getLLDPNeighbors(outputs['show lldp neighbor'])
+        detailCommands = self.getLLDPCommands(neighbors)
+        yield detailCommands, functools.partial(self.parseLLDPDetails, neighbors, detailCommands)
+
+    def parseOutputs(self, commands, responses):
+        """Parse interfaces and addresses of subset commands outputs"""
+        self.responses = responses
+        outputs = dict((splitPipe(cmd)[0], output) for cmd, output in zip(commands, responses))
 
         self.facts.setdefault('interfaces', {})
         self.facts.setdefault('info', {'macs': []})
-        interfaceData = self.parseInterfaces(self.responses[0])
+        macs = set(self.facts['info']['macs'])
+        interfaceData = self.parseInterfaces(outputs['show interfaces'], self.select)
         for intfName, intfDict in interfaceData.items():
             tmpD = self.facts['interfaces'].setdefault(intfName, {})
-            tmpD['operstatus'] = intfDict['operstatus']
-            unpLines = "\n".join(intfDict['unparsed'])
-            tmpD['description'] = self.parseDesc(unpLines)
-            # display.vvv(str(unpLines))
-            # tmpD['type'] = self.parseType(unpLines)
-            tmpD['macaddress'] = self.parseHwaddr(unpLines)
-            if tmpD['macaddress'] and tmpD['macaddress'] not in self.facts['info']['macs']:
-                self.facts['info']['macs'].append(tmpD['macaddress'])
-            tmpD['mtu'] = self.parseMTU(unpLines)
-            tmpD['bandwidth'] = self.parseBW(unpLines)
+            for key in ['operstatus', 'description', 'macaddress', 'mtu', 'bandwidth']:
+                if key in self.fields:
+                    tmpD[key] = intfDict[key]
+            macaddr = intfDict['macaddress']
+            if macaddr:
+                if macaddr not in macs:
+                    macs.add(macaddr)
+                    self.facts['info']['macs'].append(macaddr)
+                if self.indexes is not None:
+                    self.indexes['mac'].setdefault(macaddr, []).append(intfName)
             splIntf = intfName.split('.')
             if len(splIntf) == 2:
-                self.facts['interfaces'][intfName].setdefault('tagged', [])
-                self.facts['interfaces'][intfName]['tagged'].append(splIntf[0])
-
-        self.populateIPs(self.responses[1].split('\n'), 'ipv4')
-        self.populateIPs(self.responses[2].split('\n'), 'ipv6')
-
-        self.facts['lldp'] = self.populateLLDPInfo(self.responses[3])
+                if 'tagged' in self.fields:
+                    self.facts['interfaces'][intfName].setdefault('tagged', [])
+                    self.facts['interfaces'][intfName]['tagged'].append(splIntf[0])
+                if self.indexes is not None:
+                    self.indexes['parent'].setdefault(splIntf[0], []).append(intfName)
+
+        for iptype in ['ipv4', 'ipv6']:
+            if iptype in self.fields:
+                self.populateIPs(outputs['show %s interface' % iptype], iptype)
+
+    def getLLDPNeighbors(self, data):
+        """Get (interface, hostname) rows of selected interfaces from lldp neighbor table"""
+        table = Table(data)
+        try:
+            cols = [table.index('interface'), table.index('hostname')]
+        except KeyError:
+            return []
+        return [row for row in table.rows(cols) if row[0] and (self.select is None or self.select(row[0]))]
 
-    def populateLLDPInfo(self, data):
-        """Get all lldp information"""
-        out = {}
-        for line in data.split('\n'):
-            splLine = list(filter(None, line.split(' ')))
-            if len(splLine) >= 5:
-                if splLine[0] == 'interface':
-                    # Ignore first line
-                    continue
-                out.setdefault(splLine[0], self.getLLDPIntfInfo(splLine))
+    @staticmethod
+    def getLLDPCommands(neighbors):
+        """Get lldp detail commands of neighbor interfaces (once per interface),
+        all of them are sent in one batched exchange"""
+        out = []
+        for splLine in neighbors:
+            cmd = "show lldp detail %s" % splLine[0]
+            if cmd not in out:
+                out.append(cmd)
         return out
 
-    def getLLDPIntfInfo(self, splLine):
-        """Get lldp info of specific interface"""
+    def parseLLDPDetails(self, neighbors, commands, lldpInfo):
+        """Parse lldp details of all neighbors into lldp facts"""
+        out = {}
+        details = dict(zip(commands, lldpInfo))
+        for splLine in neighbors:
+            if splLine[0] in out:
+                continue
+            out[splLine[0]] = self.getLLDPIntfInfo(splLine, details.get("show lldp detail %s" % splLine[0], ''))
+            chassis = out[splLine[0]].get('remote_chassis_id')
+            if chassis and self.indexes is not None:
+                self.indexes['chassis'].setdefault(chassis, []).append(splLine[0])
+        self.facts['lldp'] = out
+
+    @classmethod
+    def getLLDPIntfInfo(cls, splLine, lldpInfo):
+        """Parse lldp detail output of specific interface"""
         def checkIfMac(inEntry):
             """ FreeRTR Check if return value is mac. It returns weird state"""
             # "b859.9fed.2bee"
@@ -143,150 +329,189 @@ class Interfaces(FactsBase):
                     return False
             return True
 
-        def normalizeMac(input):
-            """Normalize mac to normal format"""
-            macaddr = input.strip().replace('.', '')
-            split_mac = [macaddr[index: index + 2] for index in range(0, len(macaddr), 2)]
-            return ":".join(split_mac)
-
         out = {'remote_system_name': splLine[1], 'local_port_id': splLine[0]}
-        lldpInfo = self.run(["show lldp detail %s" % splLine[0]])
-        for line in lldpInfo[0].split('\n'):
+        for line in lldpInfo.split('\n'):
             if not line:
                 continue
             match = re.search(r'peer *(\S+)$', line, re.M)
             if match:
-                out['remote_chassis_id'] = normalizeMac(match.group(1))
+                out['remote_chassis_id'] = cls.normalizeMac(match.group(1))
             match = re.search(r'port id *([^$]*)$', line, re.M)
             if match:
                 tmpout = match.group(1).strip()
                 if checkIfMac(tmpout):
-                    tmpout = normalizeMac(tmpout)
+                    tmpout = cls.normalizeMac(tmpout)
                 out['remote_port_id'] = tmpout
         return out
 
     @staticmethod
-    def _getIP(data):
-        """Get IP address info"""
+    def _getIP(data, select=None):
+        """Get IP address info (of selected interfaces)"""
         out = {}
-        for line in data:
-            splLine = list(filter(None, line.split(' ')))
-            if len(splLine) == 4:
-                if splLine[0] == 'interface':
-                    # Ignore first line
-                    continue
-                out[splLine[0]] = {'address': splLine[2],
-                                   'masklen': IPAddress(splLine[3]).netmask_bits()}
+        table = Table(data)
+        try:
+            cols = [table.index('interface'), table.index('address'), table.index('netmask')]
+        except KeyError:
+            return out
+        for intName, address, netmask in table.rows(cols):
+            if intName and address and netmask and (select is None or select(intName)):
+                out[intName] = {'address': address,
+                                'masklen': IPAddress(netmask).netmask_bits()}
         return out
 
     def populateIPs(self, data, iptype):
         """Populate IPs in interfaces output"""
-        for intName, intDict in self._getIP(data).items():
+        for intName, intDict in self._getIP(data, self.select).items():
             if intName in self.facts['interfaces']:
                 self.facts['interfaces'][intName].setdefault(iptype, [])
                 self.facts['interfaces'][intName][iptype].append(intDict)
+                if self.indexes is not None:
+                    self.indexes['ip'][intDict['address']] = intName
 
     @staticmethod
-    def parseIpv6(data):
-        """Parse IPv6 address from output"""
-        #  ipv6 address=fd00:67:7e69::a:8:e:2/120, mask=ffff:ffff:ffff:ffff:ffff:ffff:ffff:ff00, ifcid=325883999
-        match = re.search(r'ipv6 address is ([^ ,]*)', data, re.M)
-        if match:
-            return match.group(1).strip()
-        return ""
+    def normalizeMac(macaddr):
+        """Normalize FreeRTR mac (0000.0bad.c0de) to 00:00:0b:ad:c0:de"""
+        macaddr = macaddr.strip().replace('.', '')
+        return ":".join([macaddr[index: index + 2] for index in range(0, len(macaddr), 2)])
 
     @staticmethod
-    def parseIpv4(data):
-        """Parse IPv4 address from output"""
-        #  ipv4 address=10.8.14.2/24, mask=255.255.255.0, ifcid=684917826
-        match = re.search(r'ipv4 address is ([^ ,]*)', data, re.M)
-        if match:
-            return match.group(1).strip()
-        return ""
-
-    @staticmethod
-    def parseVrf(data):
-        """Parse vrf from output"""
-        #  type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE
-        match = re.search(r'vrf is ([^ ,]*)', data, re.M)
-        if match:
-            return match.group(1).strip()
-        return ""
-
-    @staticmethod
-    def parseBW(data):
-        """Parse bw from output"""
-        #  type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE
-        #  type is ethernet, hwaddr=0000.0bad.c0de, mtu=1500, bw=100mbps, vrf=oob
-        for reg in [r'bw is ([^ ,]*)', r'bw=([^ ,]*)']:
-            match = re.search(reg, data, re.M)
-            if match:
-                speed = match.group(1).strip()
-                if speed.endswith('kbps'):
-                    return int(speed[:-4]) // 1000000
-                if speed.endswith('mbps'):
-                    return int(speed[:-4]) // 1000
-                if speed.endswith('gbps'):
-                    return int(speed[:-4])
+    def parseBW(speed):
+        """Parse bw value (8000kbps, 100mbps, 10gbps)"""
+        try:
+            if speed.endswith('kbps'):
+                return int(speed[:-4]) // 1000000
+            if speed.endswith('mbps'):
+                return int(speed[:-4]) // 1000
+            if speed.endswith('gbps'):
+                return int(speed[:-4])
+        except ValueError:
+            pass
         return 0
 
     @staticmethod
-    def parseMTU(data):
-        """Parse mtu from output"""
-        #  type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE
-        #  type is ethernet, hwaddr=0000.0bad.c0de, mtu=1500, bw=100mbps, vrf=oob
-        for reg in [r'mtu is ([^ ,]*)', r'mtu=([^ ,]*)']:
-            match = re.search(reg, data, re.M)
-            if match:
-                return int(match.group(1).strip())
-        return 0
+    def parseCounters(tokens, counters):
+        """Parse received/transmitted line tokens:
+        received 293405 packets (23603773 bytes) dropped 0 packets (0 bytes)
+        transmitted 15285 packets (1681350 bytes) macsec=false sgt=false"""
+        prefix = 'rx' if tokens[0] == 'received' else 'tx'
+        if prefix + '_packets' in counters:
+            return
+        try:
+            counters[prefix + '_packets'] = int(tokens[1])
+            counters[prefix + '_bytes'] = int(tokens[3][1:])
+            if len(tokens) > 8 and tokens[5] == 'dropped':
+                counters[prefix + '_drop_packets'] = int(tokens[6])
+                counters[prefix + '_drop_bytes'] = int(tokens[8][1:])
+        except (IndexError, ValueError):
+            pass
+
+    def parseTypeLine(self, line, intfDict):
+        """Parse type line. Both formats are supported:
+        type is ethernet hwaddr is 0000.0bad.c0de mtu is 1500 bw is 100mbps vrf is oob
+        type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE"""
+        for key, value in self.TYPE_RE.findall(line):
+            if key == 'hwaddr':
+                intfDict.setdefault('macaddress', self.normalizeMac(value) if value != 'none' else "")
+            elif key == 'mtu':
+                intfDict.setdefault('mtu', int(value) if value.isdigit() else 0)
+            elif key == 'bw':
+                intfDict.setdefault('bandwidth', self.parseBW(value))
+            else:
+                intfDict.setdefault(key, value)
+
+    def parseInterfaces(self, data, select=None):
+        """Parse show interfaces output in one pass. Every interface starts
+        with '<name> is <status>' line, followed by space indented lines,
+        which are dispatched by their first word. Lines of interfaces, which
+        are not selected (select(name) is False), are skipped unparsed.
+        If same interface is repeated, first seen value of each field wins"""
+        parsed = {}
+        intfDict = None
+        lineKinds = self.LINE_KINDS
+        for line in data.split('\n'):
+            if not line:
+                continue
+            if line[0] == ' ':
+                if intfDict is None:
+                    continue
+                kind = lineKinds.get(line[1:4])
+                if kind is None:
+                    continue
+                if kind == 'description':
+                    if line.startswith(' description:'):
+                        intfDict.setdefault('description', line[13:].strip())
+                elif kind == 'type':
+                    self.parseTypeLine(line, intfDict)
+                elif kind == 'counters':
+                    self.parseCounters(line.split(), intfDict['counters'])
+                elif line.startswith(' ipv4 address is ') or line.startswith(' ipv6 address is '):
+                    intfDict.setdefault(line[1:5], line[17:].split(' ', 1)[0])
+                continue
+            tokens = line.split(' ', 3)
+            if len(tokens) < 3 or tokens[1] != 'is':
+                continue
+            intName, status = tokens[0], tokens[2].rstrip(',')
+            if not intName.replace('.', '').isalnum() or not status.isalpha():
+                continue
+            if select is not None and not select(intName):
+                intfDict = None
+                continue
+            intfDict = parsed.setdefault(intName, {'operstatus': status, 'counters': {}})
+        for intfDict in parsed.values():
+            for key, value in [('description', ""), ('macaddress', ""), ('mtu', 0), ('bandwidth', 0)]:
+                intfDict.setdefault(key, value)
+        return parsed
 
-    @staticmethod
-    def parseHwaddr(data):
-        """Parse hwaddr from output"""
-        #  type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE
-        #  type is ethernet, hwaddr=0000.0bad.c0de, mtu=1500, bw=100mbps, vrf=oob
-        for reg in [r'hwaddr is ([^ ,]*)', r'hwaddr=([^ ,]*)?']:
-            match = re.search(reg, data, re.M)
-            if match and match.group(1).strip() != 'none':
-                macaddr = match.group(1).strip().replace('.', '')
-                split_mac = [macaddr[index: index + 2] for index in range(0, len(macaddr), 2)]
-                return ":".join(split_mac)
-        return ""
 
-    @staticmethod
-    def parseType(data):
-        """Parse intf type from output"""
-        # #  type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE
-        match = re.search(r'type is ([^ ,]*)', data, re.M)
-        if match:
-            return match.group(1).strip()
-        return ""
+class Counters(FactsBase):
+    """Interface counters Class. If state_dir is set, last sample is kept
+    on controller and deltas/rates since previous run are returned"""
+    COMMANDS = ['show interfaces',
+                'show platform']
+    CACHEABLE = False
+    INTERFACES_LINES = 'received|transmitted'
 
-    @staticmethod
-    def parseDesc(data):
-        """Parse description from output"""
-        match = re.search(r'description: (.+)$', data, re.M)
-        if match:
-            return match.group(1).strip()
-        return ""
+    def getCommands(self):
+        """Commands of the subset, show interfaces is filtered to used lines"""
+        return [self.showInterfaces(), 'show platform']
 
-    @staticmethod
-    def parseInterfaces(data):
-        """Parse interfaces from output"""
-        parsed = {}
-        intName = ""
+    def populate(self):
+        super(Counters, self).populate()
+        now = time.time()
+        counters = {}
+        for intfName, intfDict in Interfaces(self.module).parseInterfaces(self.responses[0]).items():
+            counters[intfName] = intfDict['counters']
+        self.facts['counters'] = counters
+
+        stateDir = self.module.params.get('state_dir')
+        if not stateDir:
+            return
+        key = deviceKey(Default.parse_hostname(self.responses[1]), Default.parse_hwid(self.responses[1]))
+        fname = stateFile(stateDir, key, 'counters')
+        previous = loadState(fname)
+        if previous.get('timestamp') and previous.get('interfaces'):
+            interval = now - previous['timestamp']
+            self.facts['counters_delta'] = {'interval': round(interval, 3), 'interfaces': {}}
+            self.facts['counters_rate'] = {}
+            for intfName, intfCounters in counters.items():
+                if intfName not in previous['interfaces']:
+                    continue
+                delta = self.getDelta(previous['interfaces'][intfName], intfCounters)
+                self.facts['counters_delta']['interfaces'][intfName] = delta
+                if interval > 0:
+                    self.facts['counters_rate'][intfName] = dict((ckey, round(cval / interval, 3))
+                                                                 for ckey, cval in delta.items())
+        saveState(fname, {'timestamp': now, 'interfaces': counters})
 
-        for line in data.split('\n'):
-            if line:
-                if line.startswith(' ') and intName:
-                    parsed[intName]['unparsed'].append(line)
-                else:
-                    match = re.match(r'^([a-zA-Z0-9.]+) is ([a-zA-Z]+),? ?(promisc)?.*', line)
-                    if match:
-                        intName = match[1]
-                        parsed.setdefault(intName, {'operstatus': match[2], 'unparsed': []})
-        return parsed
+    @staticmethod
+    def getDelta(previous, current):
+        """Get counter deltas. If counter went backwards (reset/wrap), current value is the delta"""
+        out = {}
+        for ckey, cval in current.items():
+            if ckey not in previous:
+                continue
+            out[ckey] = cval - previous[ckey] if cval >= previous[ckey] else cval
+        return out
 
 
 class Routing(FactsBase):
@@ -294,67 +519,248 @@ class Routing(FactsBase):
     COMMANDS = [
         'show vrf routing',
     ]
+    EXPORTS = ['ipv4', 'ipv6']
+
+    def __init__(self, module):
+        super(Routing, self).__init__(module)
+        # Route tables of vrfs, each is parsed as separate step
+        self.tables = []
 
     def populate(self):
-        super(Routing, self).populate()
-        parsedRoutes = self.parserouting(self.responses[0])
-        for key, vals in parsedRoutes.items():
-            self.facts.setdefault(key, [])
-            for item in vals:
-                tmpout = {'vrf': item['vrf'], 'intf': item['iface'], 'from': item['prefix']}
-                if item['hop'] != 'null':
-                    tmpout['to'] = item['hop']
-                self.facts[key].append(tmpout)
-
-    def parserouting(self, data):
-        """Parse routing"""
-        vrfs = []
-        out = {}
-        lineNum = 0
-        for line in data.split('\n'):
-            lineNum += 1
-            # Ignoring first 2 lines
-            if lineNum <= 2:
+        self.gather()
+
+    def steps(self):
+        outputs = yield self.COMMANDS, None
+        self.responses = outputs
+        # VRF table is small, it is parsed here to know which route tables to fetch
+        self.facts['vrfs'] = self.parseVrfTable(outputs[0])
+        self.tables = []
+        routeFilter = self.getRouteFilter()
+        for iptype, vrf in self.getRouteQueries(self.facts['vrfs']):
+            cmd = self.getRouteCommand(vrf, iptype, routeFilter)
+            yield [cmd], functools.partial(self.parseRoutes, vrf, iptype, routeFilter, cmd)
+        yield [], self.populateRoutes
+
+    def parseRoutes(self, vrf, iptype, routeFilter, cmd, outputs):
+        """Parse route table of one vrf. Route table text is not kept after it is parsed"""
+        self.replies.pop(cmd, None)
+        self.tables.append(RouteTable(vrf, iptype, routeFilter).parse(outputs.pop()))
+
+    def populateRoutes(self, _outputs=None):
+        """Populate route summary and routes of parsed route tables"""
+        summaryOnly = self.module.params.get('routing_summary')
+        self.facts['route_summary'] = {}
+        tables = self.tables
+        for table in tables:
+            self.facts['route_summary'].setdefault(table.vrf, {})[table.iptype] = table.summary()
+        if summaryOnly:
+            return
+        for iptype in self.EXPORTS:
+            routes = itertools.chain.from_iterable(table.toFacts() for table in tables if table.iptype == iptype)
+            if self.exports is not None:
+                # Routes are streamed to file, not kept in facts
+                self.exports.write(iptype, routes)
+            else:
+                self.facts[iptype] = list(routes)
+
+    def getRouteFilter(self):
+        """Get route filter from module parameters"""
+        params = self.module.params
+        if not any([params.get('routing_types'), params.get('routing_prefixes'), params.get('routing_summary')]):
+            return None
+        try:
+            return RouteFilter(types=params.get('routing_types'), prefixes=params.get('routing_prefixes'),
+                               summary=params.get('routing_summary'))
+        except (OSError, ValueError) as ex:
+            self.module.fail_json(msg='Bad routing_prefixes value: %s' % ex)
+            return None
+
+    def selectVrfs(self, vrfs):
+        """Apply routing_vrfs/routing_exclude_vrfs to the list of vrfs"""
+        allowVrfs = self.module.params.get('routing_vrfs')
+        denyVrfs = self.module.params.get('routing_exclude_vrfs') or []
+        out = []
+        for vrf in vrfs:
+            if allowVrfs and vrf not in allowVrfs:
+                continue
+            if vrf in denyVrfs:
                 continue
-            splLine = line.split(' ')
-            vrfs.append(splLine[0])
-        out = self.parseallvrfs(vrfs, 'ipv4', out)
-        out = self.parseallvrfs(vrfs, 'ipv6', out)
+            out.append(vrf)
         return out
 
-    def parseallvrfs(self, vrfs, iptype, out):
-        """Get and Parse all vrfs for iptype (ipv4/ipv6)"""
-        out.setdefault(iptype, [])
-        for vrf in vrfs:
-            if not vrf:
+    @staticmethod
+    def parseVrfTable(data):
+        """Parse show vrf routing into per vrf typed counters.
+        First header line has counter groups (ifc, uni, mlt, ...), second one
+        has per group address families (v4, v6) after name and rd columns"""
+        out = {}
+        table = Table(data, headers=2)
+        if not table.columns:
+            return out
+        for row in table:
+            if not row[0]:
                 continue
-            vrfInfo = self.run([f"show {iptype} route {vrf}"])
-            keys = []
-            lineNum = 0
-            for vrfEntry in vrfInfo[0].split('\n'):
-                lineNum += 1
-                values = list(filter(None, vrfEntry.split(' ')))
-                if lineNum == 1:
-                    keys = values
+            vrfInfo = {}
+            for column, groups, value in zip(table.columns[1:], table.groups[1:], row[1:]):
+                if not groups:
+                    vrfInfo[column] = value
                     continue
-                tmpDict = dict(zip(keys, values))
-                tmpDict['vrf'] = vrf
-                out[iptype].append(tmpDict)
+                try:
+                    vrfInfo.setdefault(groups[-1], {})[column] = int(value)
+                except ValueError:
+                    vrfInfo.setdefault(groups[-1], {})[column] = 0
+            out[row[0]] = vrfInfo
+        return out
+
+    def getRouteQueries(self, vrfs):
+        """Get (iptype, vrf) route tables to fetch, only vrfs with unicast routes are queried"""
+        out = []
+        for iptype, afi in [('ipv4', 'v4'), ('ipv6', 'v6')]:
+            for vrf in self.selectVrfs(vrfs.keys()):
+                if vrf and vrfs[vrf].get('uni', {}).get(afi, 1) > 0:
+                    out.append((iptype, vrf))
         return out
 
+    def getRouteCommand(self, vrf, iptype, routeFilter=None):
+        """Get route table command of vrf, route types are filtered on device if enabled"""
+        cmd = f"show {iptype} route {vrf}"
+        if routeFilter and routeFilter.types:
+            cmd = self.filtered(cmd, include=tableRows('typ', sorted(routeFilter.types)))
+        return cmd
+
 
 FACT_SUBSETS = {'default': Default,
                 'interfaces': Interfaces,
                 'routing': Routing,
+                'counters': Counters,
                 'config': Config}
 
 VALID_SUBSETS = frozenset(FACT_SUBSETS.keys())
 
+# Module parameters, which change content of parsed facts
+FACT_PARAMS = ['routing_vrfs', 'routing_exclude_vrfs', 'routing_types', 'routing_prefixes', 'routing_summary',
+               'interfaces_include', 'interfaces_exclude', 'interfaces_fields', 'interfaces_indexes',
+               'export_dir', 'export_compress']
+
+
+# Facts returned as changes only in differential mode
+DIFF_FACTS = ['interfaces', 'lldp', 'ipv4', 'ipv6']
+
+
+def routeKey(route):
+    """Key of route in differential snapshot"""
+    return "%s %s" % (route['vrf'], route['from'])
+
+
+def diffObjects(previous, current):
+    """Get added, removed and changed objects of two dicts"""
+    out = {'added': {}, 'removed': [], 'changed': {}}
+    for key, value in current.items():
+        if key not in previous:
+            out['added'][key] = value
+        elif previous[key] != value:
+            out['changed'][key] = value
+    for key in previous:
+        if key not in current:
+            out['removed'].append(key)
+    return out
+
+
+def getDifferential(module, facts):
+    """Replace large facts with changes since previous run. Previous facts
+    snapshot and generation number are kept in state_dir per device"""
+    if not module.params['state_dir']:
+        module.fail_json(msg='differential requires state_dir')
+    fname = stateFile(module.params['state_dir'], deviceKey(facts.get('hostname'), facts.get('hwid')), 'snapshot')
+    snapshot = loadState(fname)
+    generation = snapshot.get('generation', 0)
+    changes = {'previous_generation': generation}
+    modified = False
+    for key in DIFF_FACTS:
+        if key not in facts:
+            continue
+        current = facts.pop(key)
+        if key in ['ipv4', 'ipv6']:
+            current = dict((routeKey(route), route) for route in current)
+        changes[key] = diffObjects(snapshot.get(key, {}), current)
+        if key in ['ipv4', 'ipv6']:
+            changes[key]['added'] = list(changes[key]['added'].values())
+            changes[key]['changed'] = list(changes[key]['changed'].values())
+            changes[key]['removed'] = [snapshot[key][rkey] for rkey in changes[key]['removed']]
+        if changes[key]['added'] or changes[key]['removed'] or changes[key]['changed']:
+            modified = True
+        snapshot[key] = current
+    if modified or not generation:
+        generation += 1
+        snapshot['generation'] = generation
+        saveState(fname, snapshot)
+    changes['generation'] = generation
+    facts['changes'] = changes
+
+
+def getCache(module, defaultFacts):
+    """Get facts cache of device if enabled"""
+    if not module.params['cache_ttl'] or module.params['cache_ttl'] <= 0:
+        return None
+    if not module.params['state_dir']:
+        module.fail_json(msg='cache_ttl requires state_dir')
+    key = deviceKey(defaultFacts.get('hostname'), defaultFacts.get('hwid'))
+    return FactsCache(module.params['state_dir'], key, module.params['cache_ttl'], module.params['cache_size'])
+
+
+def populateCached(inst, subset, cache, submit=None):
+    """Populate subset facts from cache. Fresh entry is used as is, older entry
+    is revalidated by output digest of same commands, otherwise facts are parsed.
+    Commands are sent here, parse jobs and cache update are run by submit (pipeline)"""
+    params = dict((key, inst.module.params.get(key)) for key in FACT_PARAMS)
+    key = "%s:%s" % (subset, hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest())
+    entry = cache.get(key)
+    if entry and cache.isFresh(entry):
+        cache.stats['fresh'] += 1
+        inst.facts = entry['facts']
+        return
+    if entry and entry.get('commands'):
+        # Digest of outputs is computed while they are received
+        inst.run(entry['commands'])
+        if inst.digest.hexdigest() == entry['digest']:
+            cache.stats['revalidated'] += 1
+            cache.touch(key)
+            inst.facts = entry['facts']
+            inst.replies = {}
+            return
+        # Output changed, parse it (already received outputs are not sent again)
+        inst.used = []
+        inst.digest = OutputDigest()
+    cache.stats['miss'] += 1
+    inst.gather(submit)
+    job = functools.partial(cache.put, key, inst.facts, list(inst.used), inst.digest.hexdigest())
+    if submit is None:
+        job()
+    else:
+        submit(job)
+
 
 def main():
     """main entry point for module execution
     """
-    argument_spec = {'gather_subset': {'default': ['!config'], 'type': 'list'}}
+    argument_spec = {'gather_subset': {'default': ['!config', '!counters'], 'type': 'list'},
+                     'routing_vrfs': {'type': 'list', 'elements': 'str'},
+                     'routing_exclude_vrfs': {'type': 'list', 'elements': 'str'},
+                     'routing_types': {'type': 'list', 'elements': 'str'},
+                     'routing_prefixes': {'type': 'list', 'elements': 'str'},
+                     'routing_summary': {'type': 'bool', 'default': False},
+                     'state_dir': {'type': 'path'},
+                     'cache_ttl': {'type': 'int', 'default': 0},
+                     'cache_size': {'type': 'int', 'default': 32},
+                     'differential': {'type': 'bool', 'default': False},
+                     'pipeline': {'type': 'bool', 'default': False},
+                     'pushdown': {'type': 'bool', 'default': False},
+                     'interfaces_include': {'type': 'list', 'elements': 'str'},
+                     'interfaces_exclude': {'type': 'list', 'elements': 'str'},
+                     'interfaces_fields': {'type': 'list', 'elements': 'str', 'choices': INTERFACE_FIELDS},
+                     'interfaces_indexes': {'type': 'bool', 'default': False},
+                     'export_dir': {'type': 'path'},
+                     'export_compress': {'type': 'bool', 'default': False}}
     argument_spec.update(freertr_argument_spec)
     module = AnsibleModule(argument_spec=argument_spec,
                            supports_check_mode=True)
@@ -389,13 +795,43 @@ def main():
     facts = {'gather_subset': [runable_subsets]}
 
     instances = []
-    for key in runable_subsets:
-        instances.append(FACT_SUBSETS[key](module))
-
-    for inst in instances:
-        if inst:
-            inst.populate()
-            facts.update(inst.facts)
+    # Default is always first, others in fixed order (same facts and commands order every run)
+    for key in sorted(runable_subsets, key=lambda item: (item != 'default', item)):
+        inst = FACT_SUBSETS[key](module)
+        inst.subsets = runable_subsets
+        instances.append((key, inst))
+
+    # Default runs alone, it identifies device for the cache
+    key, inst = instances.pop(0)
+    inst.populate()
+    facts.update(inst.facts)
+    cache = getCache(module, inst.facts)
+    exports = None
+    if module.params['export_dir']:
+        exports = Exports(module.params['export_dir'], deviceKey(inst.facts.get('hostname'), inst.facts.get('hwid')),
+                          module.params['export_compress'])
+
+    pipeline = Pipeline() if module.params['pipeline'] else None
+    for key, inst in instances:
+        inst.exports = exports
+        # Exported facts are written by every run, cached manifest could point to other content
+        # In pipeline, commands are sent here and outputs are parsed in worker
+        submit = pipeline.submit if pipeline else None
+        if cache and inst.CACHEABLE and not (exports and inst.EXPORTS):
+            populateCached(inst, key, cache, submit)
+        else:
+            inst.gather(submit)
+    if pipeline:
+        pipeline.close()
+    for key, inst in instances:
+        facts.update(inst.facts)
+    if cache:
+        cache.save()
+        facts['cache'] = cache.stats
+    if exports:
+        facts['export'] = exports.manifest
+    if module.params['differential']:
+        getDifferential(module, facts)
 
     ansible_facts = {}
     for key, value in iteritems(facts):
@@ -404,7 +840,9 @@ def main():
 
     warnings = []
     check_args(module, warnings)
-    module.exit_json(ansible_facts=ansible_facts, warnings=warnings)
+    planner = get_planner(module)
+    module.exit_json(ansible_facts=ansible_facts, warnings=warnings,
+                     commands_sent=planner.sent, command_stats=planner.stats)
 
 
 if __name__ == '__main__':
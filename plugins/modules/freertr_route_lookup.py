@@ -0,0 +1,77 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Contributors to the Ansible project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Longest prefix match of destinations in FreeRTR vrf route table.
+Route table (show ipv4/ipv6 route <vrf>) is parsed into RouteTable and
+radix trie, only routes of destinations are returned."""
+from ansible.module_utils.basic import AnsibleModule
+from ansible.utils.display import Display
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import run_commands
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import freertr_argument_spec, check_args
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable
+from ansible_collections.sense.freertr.plugins.module_utils.network.radix import RadixTrie, parsePrefix
+
+display = Display()
+
+
+def parseDestinations(module):
+    """Parse destinations into (destination, iptype, key, length)"""
+    out = []
+    for item in module.params['destinations']:
+        try:
+            out.append((item,) + parsePrefix(item))
+        except ValueError as ex:
+            module.fail_json(msg='Bad destination: %s' % ex)
+    return out
+
+
+def lookupRoutes(table, trie, destinations):
+    """Answer destinations of one address family"""
+    out = []
+    for item, _iptype, key, length in destinations:
+        idx = trie.lookup(key, length)
+        if idx == -1:
+            out.append({'destination': item, 'vrf': table.vrf, 'found': False})
+            continue
+        route = table.route(idx)
+        answer = {'destination': item, 'vrf': table.vrf, 'found': True, 'prefix': route.prefix,
+                  'type': route.typ, 'iface': route.iface, 'distance': route.distance, 'metric': route.metric}
+        if route.hop != 'null':
+            answer['hop'] = route.hop
+        out.append(answer)
+    return out
+
+
+def main():
+    """main entry point for module execution
+    """
+    argument_spec = {'vrf': {'type': 'str', 'required': True},
+                     'destinations': {'type': 'list', 'elements': 'str', 'required': True}}
+    argument_spec.update(freertr_argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+    warnings = []
+    check_args(module, warnings)
+
+    destinations = parseDestinations(module)
+    vrf = module.params['vrf']
+    answers = {}
+    routes = {}
+    for iptype in ['ipv4', 'ipv6']:
+        queries = [item for item in destinations if item[1] == iptype]
+        if not queries:
+            continue
+        output = run_commands(module, ['show %s route %s' % (iptype, vrf)])[0]
+        table = RouteTable(vrf, iptype).parse(output)
+        routes[iptype] = len(table)
+        for query, answer in zip(queries, lookupRoutes(table, RadixTrie.fromTable(table), queries)):
+            answers[query[0]] = answer
+
+    module.exit_json(changed=False, warnings=warnings, routes=routes,
+                     lookups=[answers[item[0]] for item in destinations])
+
+
+if __name__ == '__main__':
+    main()
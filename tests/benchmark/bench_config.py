@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark freertr_config diff: config.FreeRTRConfig against netcommon
+NetworkConfig (previous implementation, kept here as reference only).
+
+Running config is show_running-config fixture scaled up (every top level
+block repeated under new name). Candidates are a changed interface block
+(lines with parents, strict and line match) and last blocks of running
+config as src (line match), so lookups hit the end of running config.
+Both implementations must return same commands.
+
+Run: python tests/benchmark/bench_config.py [factor]
+"""
+import sys
+import time
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import NetworkConfig
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import dumps as netDumps
+from ansible_collections.sense.freertr.plugins.module_utils.network.config import FreeRTRConfig, dumps
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+def scale_config(config, factor):
+    """Repeat config factor times, top level lines of copy N get suffix cN"""
+    lines = []
+    body = [line for line in config.split('\n') if line.strip() not in ['exit', 'end']]
+    for copy in range(factor):
+        for line in body:
+            if copy and line and not line.startswith((' ', '!')):
+                line = '%sc%d' % (line, copy)
+            lines.append(line)
+    return '\n'.join(lines) + '\nend\n'
+
+
+def diff_netcommon(running, lines, parents, src, match):
+    """Previous diff: NetworkConfig parse and difference"""
+    candidate = NetworkConfig(indent=1)
+    if src:
+        candidate.load(src)
+    else:
+        candidate.add(lines, parents=parents)
+    config = NetworkConfig(contents=running, indent=1)
+    out = netDumps(candidate.difference(config, match=match, path=parents, replace='line'), 'commands')
+    return out.split('\n') if out else []
+
+
+def diff_tree(running, lines, parents, src, match):
+    """FreeRTRConfig parse and difference"""
+    candidate = FreeRTRConfig()
+    if src:
+        candidate.load(src)
+    else:
+        candidate.add(lines, parents=parents)
+    config = FreeRTRConfig(running)
+    return dumps(candidate.difference(config, match=match, path=parents, replace='line'))
+
+
+def timeit(func, args, rounds=3):
+    """Return best of rounds run time and result"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = func(*args)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best, out
+
+
+def main():
+    factor = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    running = scale_config(load_fixture('show_running-config'), factor)
+    parent = 'interface ethernet1c%d' % (factor - 1) if factor > 1 else 'interface ethernet1'
+    src = '\n'.join(running.split('\n')[-400:])
+    cases = [('lines line', ['description changed', 'vrf forwarding oob'], [parent], None, 'line'),
+             ('lines strict', ['description changed', 'vrf forwarding oob'], [parent], None, 'strict'),
+             ('src line', None, [], src, 'line')]
+    print('running config: %d lines' % running.count('\n'))
+    for name, lines, parents, src, match in cases:
+        args = (running, lines, parents, src, match)
+        netTook, expected = timeit(diff_netcommon, args, rounds=1)
+        took, result = timeit(diff_tree, args)
+        assert expected == result, name
+        print('%-13s netcommon %8.4fs  tree %8.4fs  %6.1fx  %d commands' % (
+            name + ':', netTook, took, netTook / took, len(result)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""End-to-end benchmark of freertr_facts, freertr_command and freertr_config
+against the FreeRTR CLI simulator (see simulator.py).
+
+Reports wall-clock time, device round trips (commands received by the
+simulator) and, in inprocess mode, connection RPCs of every task. Round trips
+and RPCs do not depend on the host, they are compared with stored baseline
+(e2e_baseline.json, per mode, RPCs under <mode>_rpcs) and any increase is a
+regression.
+
+Modes:
+    inprocess  modules run in this process, module_utils persistent
+               connection and network_cli are replaced by simulator stand-ins
+               (SimRPC, SimConnection). Needs nothing but this collection.
+    ssh        simulator is served over SSH (paramiko) and every task runs
+               with ansible-playbook over network_cli. Wall-clock time then
+               includes ansible-playbook start and connection login.
+
+Run: python tests/benchmark/bench_e2e.py [--mode inprocess|ssh] [--latency 0.01] [--update-baseline]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from unittest import mock
+
+from ansible.module_utils import basic
+from ansible_collections.sense.freertr.plugins.modules import freertr_facts, freertr_command, freertr_config
+from ansible_collections.sense.freertr.tests.benchmark.simulator import FreeRTRShell, SimRPC, load_fixtures, serve
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import set_module_args
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import AnsibleExitJson, AnsibleFailJson
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import exit_json, fail_json
+
+MODULES = {'freertr_facts': freertr_facts, 'freertr_command': freertr_command, 'freertr_config': freertr_config}
+
+TASKS = [('freertr_facts', {'gather_subset': ['interfaces', 'routing']}),
+         ('freertr_command', {'commands': ['show platform', 'show ipv4 interface']}),
+         ('freertr_config', {'lines': ['description simulated port'], 'parents': ['interface ethernet1'],
+                             'save': True})]
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'e2e_baseline.json')
+
+
+def run_inprocess(task, args, rpc):
+    """Run module main() with simulator connection, return module result"""
+    set_module_args(dict(args, _ansible_socket='/simulator'))
+    with mock.patch.multiple(basic.AnsibleModule, exit_json=exit_json, fail_json=fail_json), \
+            mock.patch('ansible_collections.sense.freertr.plugins.module_utils.network.freertr.Connection',
+                       return_value=rpc), \
+            mock.patch('ansible.module_utils.connection.Connection', return_value=rpc):
+        try:
+            MODULES[task].main()
+        except AnsibleExitJson as ex:
+            return ex.args[0]
+        except AnsibleFailJson as ex:
+            return ex.args[0]
+    return {}
+
+
+def run_ssh(task, args, port, workdir):
+    """Run task with ansible-playbook over network_cli, return exit code"""
+    inventory = os.path.join(workdir, 'inventory.ini')
+    with open(inventory, 'w', encoding='utf-8') as fd:
+        fd.write('[freertr]\nsim ansible_host=127.0.0.1 ansible_port=%d ansible_user=sim ansible_password=sim '
+                 'ansible_connection=ansible.netcommon.network_cli '
+                 'ansible_network_os=sense.freertr.freertr\n' % port)
+    playbook = os.path.join(workdir, '%s.yml' % task)
+    with open(playbook, 'w', encoding='utf-8') as fd:
+        json.dump([{'hosts': 'freertr', 'gather_facts': False,
+                    'tasks': [{'name': task, 'sense.freertr.%s' % task: args}]}], fd)
+    env = dict(os.environ, ANSIBLE_HOST_KEY_CHECKING='False', ANSIBLE_NETWORK_CLI_SSH_TYPE='paramiko')
+    return subprocess.call(['ansible-playbook', '-i', inventory, playbook], env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_suite(mode='inprocess', latency=0.0, outputs=None):
+    """Run all tasks, return {task: {'seconds', 'round_trips', 'rpcs', 'failed'}}"""
+    outputs = outputs or load_fixtures()
+    log = []
+    results = {}
+    if mode == 'ssh':
+        sock, port = serve(outputs, log=log, latency=latency)
+        workdir = tempfile.mkdtemp()
+    else:
+        rpc = SimRPC(FreeRTRShell(outputs, latency=latency, log=log))
+    try:
+        for task, args in TASKS:
+            start = time.perf_counter()
+            sent = len(log)
+            calls = 0 if mode == 'ssh' else rpc.calls
+            if mode == 'ssh':
+                failed = run_ssh(task, args, port, workdir) != 0
+            else:
+                failed = bool(run_inprocess(task, args, rpc).get('failed'))
+            results[task] = {'seconds': round(time.perf_counter() - start, 4), 'round_trips': len(log) - sent,
+                             'rpcs': None if mode == 'ssh' else rpc.calls - calls, 'failed': failed}
+    finally:
+        if mode == 'ssh':
+            sock.close()
+    return results
+
+
+def load_baseline(path=BASELINE):
+    """Load stored round trip baseline of all modes"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as fd:
+        return json.load(fd)
+
+
+def compare(results, baseline, rpcs=None):
+    """Return list of failed tasks and round trip (and RPC) regressions"""
+    out = []
+    rpcs = rpcs or {}
+    for task, result in sorted(results.items()):
+        if result['failed']:
+            out.append('%s failed' % task)
+        base = baseline.get(task)
+        if base is not None and result['round_trips'] > base:
+            out.append('%s round trips: %d > %d' % (task, result['round_trips'], base))
+        base = rpcs.get(task)
+        if base is not None and result['rpcs'] is not None and result['rpcs'] > base:
+            out.append('%s rpcs: %d > %d' % (task, result['rpcs'], base))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FreeRTR end-to-end benchmark')
+    parser.add_argument('--mode', default='inprocess', choices=['inprocess', 'ssh'])
+    parser.add_argument('--latency', type=float, default=0.0, help='per command latency (seconds)')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+    results = run_suite(args.mode, args.latency)
+    for task, result in results.items():
+        print('%-16s %8.4fs  %4d round trips  %4s rpcs%s' % (task, result['seconds'], result['round_trips'],
+                                                            result['rpcs'], '  FAILED' if result['failed'] else ''))
+    baseline = load_baseline()
+    if args.update_baseline:
+        baseline[args.mode] = dict((task, result['round_trips']) for task, result in results.items())
+        if args.mode == 'inprocess':
+            baseline[args.mode + '_rpcs'] = dict((task, result['rpcs']) for task, result in results.items())
+        with open(BASELINE, 'w', encoding='utf-8') as fd:
+            json.dump(baseline, fd, indent=2, sort_keys=True)
+            fd.write('\n')
+        return 0
+    regressions = compare(results, baseline.get(args.mode, {}), baseline.get(args.mode + '_rpcs'))
+    for item in regressions:
+        print('REGRESSION %s' % item)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark show interfaces parsing on generated output.
+
+Compares single pass Interfaces.parseInterfaces tokenizer with previous
+regex per field implementation (kept here as reference only), extracting
+same set of fields (description, type, hwaddr, mtu, bw, vrf, addresses
+and counters).
+
+Run: python tests/benchmark/bench_interfaces.py [interfaces]
+"""
+import re
+import sys
+import time
+
+from ansible_collections.sense.freertr.plugins.modules.freertr_facts import Interfaces
+from ansible_collections.sense.freertr.tests.benchmark.generator import generate_interfaces
+
+
+class LegacyInterfaces:
+    """Previous regex based parser (reference for the benchmark)"""
+
+    @staticmethod
+    def parseInterfaces(data):
+        parsed = {}
+        intName = ""
+        for line in data.split('\n'):
+            if line:
+                if line.startswith(' ') and intName:
+                    parsed[intName]['unparsed'].append(line)
+                else:
+                    match = re.match(r'^([a-zA-Z0-9.]+) is ([a-zA-Z]+),? ?(promisc)?.*', line)
+                    if match:
+                        intName = match[1]
+                        parsed.setdefault(intName, {'operstatus': match[2], 'unparsed': []})
+        return parsed
+
+    @staticmethod
+    def parseBW(data):
+        for reg in [r'bw is ([^ ,]*)', r'bw=([^ ,]*)']:
+            match = re.search(reg, data, re.M)
+            if match:
+                speed = match.group(1).strip()
+                if speed.endswith('kbps'):
+                    return int(speed[:-4]) // 1000000
+                if speed.endswith('mbps'):
+                    return int(speed[:-4]) // 1000
+                if speed.endswith('gbps'):
+                    return int(speed[:-4])
+        return 0
+
+    @staticmethod
+    def parseMTU(data):
+        for reg in [r'mtu is ([^ ,]*)', r'mtu=([^ ,]*)']:
+            match = re.search(reg, data, re.M)
+            if match:
+                return int(match.group(1).strip())
+        return 0
+
+    @staticmethod
+    def parseHwaddr(data):
+        for reg in [r'hwaddr is ([^ ,]*)', r'hwaddr=([^ ,]*)?']:
+            match = re.search(reg, data, re.M)
+            if match and match.group(1).strip() != 'none':
+                macaddr = match.group(1).strip().replace('.', '')
+                split_mac = [macaddr[index: index + 2] for index in range(0, len(macaddr), 2)]
+                return ":".join(split_mac)
+        return ""
+
+    @staticmethod
+    def parseDesc(data):
+        match = re.search(r'description: (.+)$', data, re.M)
+        if match:
+            return match.group(1).strip()
+        return ""
+
+    @staticmethod
+    def parseSimple(reg, data):
+        match = re.search(reg, data, re.M)
+        if match:
+            return match.group(1).strip()
+        return ""
+
+    @staticmethod
+    def parseCounters(data):
+        out = {}
+        for direction, prefix in [('received', 'rx'), ('transmitted', 'tx')]:
+            match = re.search(direction + r' (\d+) packets \((\d+) bytes\)(?: dropped (\d+) packets \((\d+) bytes\))?',
+                              data, re.M)
+            if match:
+                out[prefix + '_packets'] = int(match.group(1))
+                out[prefix + '_bytes'] = int(match.group(2))
+                if match.group(3) is not None:
+                    out[prefix + '_drop_packets'] = int(match.group(3))
+                    out[prefix + '_drop_bytes'] = int(match.group(4))
+        return out
+
+    @classmethod
+    def populate(cls, data):
+        """Same fields as single pass parser, with previous per field regex helpers"""
+        out = {}
+        for intfName, intfDict in cls.parseInterfaces(data).items():
+            unpLines = "\n".join(intfDict['unparsed'])
+            out[intfName] = {'operstatus': intfDict['operstatus'],
+                             'description': cls.parseDesc(unpLines),
+                             'macaddress': cls.parseHwaddr(unpLines),
+                             'mtu': cls.parseMTU(unpLines),
+                             'bandwidth': cls.parseBW(unpLines),
+                             'type': cls.parseSimple(r'type is ([^ ,]*)', unpLines),
+                             'vrf': cls.parseSimple(r'vrf is ([^ ,]*)', unpLines),
+                             'ipv4': cls.parseSimple(r'ipv4 address is ([^ ,]*)', unpLines),
+                             'ipv6': cls.parseSimple(r'ipv6 address is ([^ ,]*)', unpLines),
+                             'counters': cls.parseCounters(unpLines)}
+        return out
+
+
+def timeit(func, data, rounds=5):
+    """Return best of rounds run time"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(data)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = generate_interfaces(count, vrfs=16)
+    legacy = timeit(LegacyInterfaces.populate, data)
+    current = timeit(Interfaces(None).parseInterfaces, data)
+    print('interfaces: %d, lines: %d' % (count, data.count('\n') + 1))
+    print('legacy regex parser: %.4fs' % legacy)
+    print('single pass parser:  %.4fs' % current)
+    print('speed-up: %.2fx' % (legacy / current))
+
+
+if __name__ == '__main__':
+    main()
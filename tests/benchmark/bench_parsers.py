@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark suite of Default, Interfaces and Routing facts parsers.
+
+Each parser populates facts from generated output (see generator.py), no
+commands are sent. Suite reports best of rounds run time and traced peak
+memory of every parser and compares them with stored baseline
+(baseline.json, per scale). Result worse than baseline by more than
+tolerance is a regression and suite exits with error.
+
+Run: python tests/benchmark/bench_parsers.py [--scale small|full] [--update-baseline]
+Unit tests run it when FREERTR_BENCHMARK is set to a scale name.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from ansible_collections.sense.freertr.plugins.modules.freertr_facts import Default, Interfaces, Routing, FACT_PARAMS
+from ansible_collections.sense.freertr.tests.benchmark.generator import generate_outputs
+
+PARSERS = {'default': Default, 'interfaces': Interfaces, 'routing': Routing}
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Allowed regression (fraction of baseline) and absolute slack for values
+# near zero. Time depends on the host and its load, memory does not
+TOLERANCE = {'seconds': 1.0, 'peak_mb': 0.1}
+SLACK = {'seconds': 0.05, 'peak_mb': 0.5}
+
+
+class BenchModule:
+    """Module stand-in with default facts parameters"""
+
+    def __init__(self):
+        self.params = dict((key, None) for key in FACT_PARAMS)
+
+    @staticmethod
+    def fail_json(**kwargs):
+        raise RuntimeError(kwargs.get('msg'))
+
+
+def populate(cls, outputs):
+    """Populate facts of parser class from known outputs"""
+    inst = cls(BenchModule())
+    inst.replies = dict(outputs)
+    inst.populate()
+    return inst
+
+
+def measure(cls, outputs, rounds=5):
+    """Return best run time (seconds) and traced peak memory (MB) of parser"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        populate(cls, outputs)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    tracemalloc.start()
+    try:
+        populate(cls, outputs)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(best, 4), 'peak_mb': round(peak / 1048576.0, 2)}
+
+
+def run_suite(scale, rounds=5):
+    """Run all parsers at scale"""
+    outputs = generate_outputs(scale)
+    return dict((name, measure(cls, outputs, rounds)) for name, cls in PARSERS.items())
+
+
+def load_baseline(path=BASELINE):
+    """Load stored baseline of all scales"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as fd:
+        return json.load(fd)
+
+
+def compare(results, baseline, tolerance=None):
+    """Return list of regressions of results against baseline"""
+    tolerance = tolerance or TOLERANCE
+    out = []
+    for name, result in sorted(results.items()):
+        for key, limit in tolerance.items():
+            base = baseline.get(name, {}).get(key)
+            if base is not None and result[key] > base * (1 + limit) + SLACK[key]:
+                out.append('%s %s: %s > %s (+%d%%)' % (name, key, result[key], base, int(limit * 100)))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FreeRTR facts parser benchmark')
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+    results = run_suite(args.scale, args.rounds)
+    for name, result in sorted(results.items()):
+        print('%-11s %8.4fs  %8.2f MB' % (name, result['seconds'], result['peak_mb']))
+    baseline = load_baseline()
+    if args.update_baseline:
+        baseline[args.scale] = results
+        with open(BASELINE, 'w', encoding='utf-8') as fd:
+            json.dump(baseline, fd, indent=2, sort_keys=True)
+            fd.write('\n')
+        return 0
+    regressions = compare(results, baseline.get(args.scale, {}))
+    for item in regressions:
+        print('REGRESSION %s' % item)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
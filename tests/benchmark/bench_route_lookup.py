@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark radix trie longest prefix match on a generated route table.
+
+Parses generated show ipv4 route output (see generator.py, default 1M
+routes plus default route) into RouteTable, builds radix.RadixTrie from it
+and answers a batch of random destination lookups. Reports parse, build and
+query time, trie nodes and memory of node arrays.
+
+Run: python tests/benchmark/bench_route_lookup.py [routes] [queries]
+"""
+import sys
+import time
+import random
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable
+from ansible_collections.sense.freertr.plugins.module_utils.network.radix import RadixTrie, parsePrefix
+from ansible_collections.sense.freertr.tests.benchmark.generator import generate_routes
+
+
+def timed(func, *args):
+    """Return run time and result of func"""
+    start = time.perf_counter()
+    out = func(*args)
+    return time.perf_counter() - start, out
+
+
+def lookupAll(trie, keys):
+    """Look up all keys, return number of found routes"""
+    lookup = trie.lookup
+    return sum(1 for key in keys if lookup(key) != -1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    data = generate_routes(count)
+    data += 'DEF  0.0.0.0/0  0/2  sdn12000  10.0.0.1  1d\n'
+    parseTook, table = timed(RouteTable('vrf0', 'ipv4').parse, data)
+    buildTook, trie = timed(RadixTrie.fromTable, table)
+    rnd = random.Random(1)
+    keys = [parsePrefix('%d.%d.%d.%d' % (rnd.randint(1, 30), rnd.randint(0, 255), rnd.randint(0, 255),
+                                         rnd.randint(0, 255)))[1] for _ in range(queries)]
+    queryTook, found = timed(lookupAll, trie, keys)
+    assert found == queries
+    print('routes:  %d parsed in %.2fs' % (len(table), parseTook))
+    print('build:   %.2fs  %d nodes  %.1f MB nodes' % (buildTook, len(trie), trie.nbytes() / 1048576.0))
+    print('lookup:  %d queries in %.2fs  %.0f lookups/s' % (queries, queryTook, queries / queryTook))
+
+
+if __name__ == '__main__':
+    main()
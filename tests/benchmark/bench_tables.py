@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark column aligned table parsing throughput (lines per second).
+
+Parses generated, column aligned show ipv4 route output with tables.Table
+and with previous whitespace split of every line (kept here as reference
+only), selecting same route columns. Sparse output has empty hop cells on
+every second row, which only Table parses (by column offsets).
+
+Run: python tests/benchmark/bench_tables.py [routes]
+"""
+import sys
+import time
+from operator import itemgetter
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.tables import Table, iterLines
+from ansible_collections.sense.freertr.tests.benchmark.generator import generate_routes
+
+COLUMNS = ['typ', 'prefix', 'metric', 'iface', 'hop', 'time']
+
+
+def parse_split(data):
+    """Previous parsing: split every line, header gives column order"""
+    getter = None
+    count = 0
+    for line in iterLines(data):
+        values = line.split()
+        if not values:
+            continue
+        if getter is None:
+            getter = itemgetter(*[values.index(key) for key in COLUMNS])
+            continue
+        getter(values)
+        count += 1
+    return count
+
+
+def parse_table(data):
+    """Table parsing: offsets from header, select columns"""
+    table = Table(data)
+    count = 0
+    for _row in table.rows([table.index(key) for key in COLUMNS]):
+        count += 1
+    return count
+
+
+def timeit(func, data, rounds=5):
+    """Return best of rounds run time"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(data)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = generate_routes(count)
+    sparse = generate_routes(count, sparse=True)
+    assert parse_split(data) == parse_table(data) == parse_table(sparse) == count
+    lines = count + 1
+    for name, func, output in [('whitespace split', parse_split, data), ('table', parse_table, data),
+                               ('table (sparse)', parse_table, sparse)]:
+        took = timeit(func, output)
+        print('%-17s %.4fs  %10.0f lines/s' % (name + ':', took, lines / took))
+
+
+if __name__ == '__main__':
+    main()
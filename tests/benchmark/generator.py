@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Synthetic FreeRTR CLI output at configurable scale.
+
+Output has same format as unit test fixtures (tests/unit/modules/fixtures):
+show platform, show interfaces (N physical interfaces with sub-interfaces),
+show ipv4/ipv6 interface, show vrf routing (M vrfs), show ipv4/ipv6 route
+per vrf (routes spread over vrfs), show lldp neighbor and show lldp detail
+(K neighbors). Tables are column aligned as printed by FreeRTR.
+
+Output is deterministic for same scale, so benchmark results are comparable.
+"""
+import os
+import sys
+
+# Benchmark scales. full is the scale of a big production router
+SCALES = {'small': {'interfaces': 64, 'subinterfaces': 4, 'vrfs': 4, 'routes': 20000, 'neighbors': 16},
+          'full': {'interfaces': 512, 'subinterfaces': 8, 'vrfs': 16, 'routes': 1000000, 'neighbors': 256}}
+
+
+def table(header, rows, groups=None):
+    """Format column aligned table (columns padded to widest value plus two spaces)"""
+    allRows = [header] + rows
+    widths = [max(len(row[col]) for row in allRows) + 2 for col in range(len(header))]
+    lines = []
+    if groups:
+        # Group name starts at the first column of the group
+        line = ''
+        for col, width in enumerate(widths):
+            line += groups.get(col, '').ljust(width)
+        lines.append(line.rstrip())
+    for row in allRows:
+        lines.append(''.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    return '\n'.join(lines) + '\n'
+
+
+def mac(idx):
+    """Return FreeRTR formatted mac address"""
+    return '0073.%04x.%04x' % ((idx >> 16) & 0xffff, idx & 0xffff)
+
+
+def interface_names(count, subinterfaces=0):
+    """Return names of count physical interfaces and their sub-interfaces"""
+    out = []
+    for idx in range(count):
+        name = 'sdn%d' % (12000 + idx)
+        out.append(name)
+        for sub in range(subinterfaces):
+            out.append('%s.%d' % (name, 100 + sub))
+    return out
+
+
+def generate_platform(hostname='rare', hwid='accton_as9516_32d'):
+    """Generate show platform output"""
+    return ('freeRouter v23.4.21-cur, done by cs@nop.\n\n'
+            'name: %s\nhwid: %s\nhwsn: null\n'
+            'uptime: since 2023-06-21 00:45:11, for 1d18h\n'
+            'reload: code#3=user requested\n'
+            'cpu: 8*amd64\nmem: free=100m, max=2147m, used=306m\n'
+            'host: Linux v5.10.0-8-amd64\n' % (hostname, hwid))
+
+
+def generate_interfaces(count, subinterfaces=0, vrfs=1):
+    """Generate show interfaces output with count interfaces and their sub-interfaces"""
+    lines = []
+    for idx, name in enumerate(interface_names(count, subinterfaces)):
+        lines.append('%s is %s' % (name, 'up' if idx % 5 else 'down'))
+        lines.append(' description: %s' % ('vlan %d towards site %d' % (idx, idx % 97) if idx % 3 else ''))
+        lines.append(' state changed 2 times, last at 2023-06-21 00:45:10, 1d18h ago')
+        lines.append(' last packet input 00:00:00 ago, output 00:00:10 ago, drop never ago')
+        lines.append(' type is sdn hwaddr is %s mtu is 9000 bw is 100gbps vrf is vrf%d' % (mac(idx), idx % vrfs))
+        lines.append(' ipv4 address is 10.%d.%d.1/30 ifcid=%d' % ((idx >> 8) & 255, idx & 255, idx))
+        lines.append(' ipv6 address is 2001:db8:%x::1/64 ifcid=%d' % (idx, idx))
+        lines.append(' received %d packets (%d bytes) dropped %d packets (%d bytes)' % (
+            idx * 10, idx * 1500, idx % 7, (idx % 7) * 64))
+        lines.append(' transmitted %d packets (%d bytes) macsec=false sgt=false' % (idx * 20, idx * 3000))
+    return '\n'.join(lines) + '\n'
+
+
+def generate_ip_interface(count, iptype='ipv4', subinterfaces=0):
+    """Generate show ipv4/ipv6 interface output"""
+    rows = []
+    for idx, name in enumerate(interface_names(count, subinterfaces)):
+        if iptype == 'ipv4':
+            rows.append([name, 'up', '10.%d.%d.1' % ((idx >> 8) & 255, idx & 255), '255.255.255.252'])
+        else:
+            rows.append([name, 'up', '2001:db8:%x::1' % idx, 'ffff:ffff:ffff:ffff::'])
+    return table(['interface', 'state', 'address', 'netmask'], rows)
+
+
+def route_counts(vrfs, routes):
+    """Split routes over vrfs, first vrf gets the rest"""
+    out = dict(('vrf%d' % idx, routes // vrfs) for idx in range(vrfs))
+    out['vrf0'] += routes - sum(out.values())
+    return out
+
+
+def generate_vrf_routing(vrfs, routes=0):
+    """Generate show vrf routing output. ipv6 has a tenth of ipv4 routes"""
+    header = ['name', 'rd']
+    groups = {}
+    for group in ['ifc', 'uni', 'mlt', 'flw', 'lab', 'con']:
+        groups[len(header)] = group
+        header += ['v4', 'v6']
+    rows = []
+    for vrf, count in route_counts(vrfs, routes).items():
+        row = [vrf, '0:%s' % vrf[3:]]
+        for group in ['ifc', 'uni', 'mlt', 'flw', 'lab', 'con']:
+            if group in ['uni', 'mlt']:
+                row += [str(count), str(count // 10)]
+            else:
+                row += ['1', '1']
+        rows.append(row)
+    return table(header, rows, groups)
+
+
+def generate_routes(count, iptype='ipv4', seed=0, sparse=False):
+    """Generate show ipv4/ipv6 route output with count routes.
+    sparse leaves hop cell of every second route empty"""
+    rows = []
+    for idx in range(count):
+        if iptype == 'ipv4':
+            prefix = '%d.%d.%d.0/24' % (1 + ((idx >> 16) + seed) % 223, (idx >> 8) & 255, idx & 255)
+            hop = '10.0.%d.1' % (idx % 64)
+        else:
+            prefix = '2001:%x:%x::/48' % (seed, idx)
+            hop = '2001:db8::%x' % (idx % 64)
+        if sparse and idx % 2:
+            hop = ''
+        rows.append(['B', prefix, '20/%d' % (idx % 7), 'sdn%d' % (12000 + idx % 32), hop,
+                     '%dd%dh' % (idx % 30, idx % 24)])
+    return table(['typ', 'prefix', 'metric', 'iface', 'hop', 'time'], rows)
+
+
+def generate_lldp_neighbor(count):
+    """Generate show lldp neighbor output with count neighbors"""
+    rows = []
+    for idx in range(count):
+        rows.append(['sdn%d' % (12000 + idx), 'host-%d.example.org' % idx, mac(0x100000 + idx),
+                     '172.16.%d.%d' % (idx >> 8, idx & 255), '2001:db8:10::%x' % idx])
+    return table(['interface', 'hostname', 'iface', 'ipv4', 'ipv6'], rows)
+
+
+def generate_lldp_detail(idx):
+    """Generate show lldp detail <interface> output of neighbor idx"""
+    rows = [['peer', mac(0x100000 + idx)], ['system name', 'host-%d.example.org' % idx],
+            ['port id', mac(0x200000 + idx)], ['port desc', 'port%d' % idx],
+            ['ipv4 addr', '172.16.%d.%d' % (idx >> 8, idx & 255)], ['ttl', '120000']]
+    return table(['category', 'value'], rows).replace('\n', '\n\n', 1)
+
+
+def generate_outputs(scale):
+    """Return {command: output} of all facts commands at scale (name or dict)"""
+    scale = SCALES[scale] if isinstance(scale, str) else scale
+    vrfs = scale['vrfs']
+    outputs = {'show platform': generate_platform(),
+               'show interfaces': generate_interfaces(scale['interfaces'], scale['subinterfaces'], vrfs),
+               'show ipv4 interface': generate_ip_interface(scale['interfaces'], 'ipv4', scale['subinterfaces']),
+               'show ipv6 interface': generate_ip_interface(scale['interfaces'], 'ipv6', scale['subinterfaces']),
+               'show vrf routing': generate_vrf_routing(vrfs, scale['routes']),
+               'show lldp neighbor': generate_lldp_neighbor(scale['neighbors'])}
+    for seed, (vrf, count) in enumerate(route_counts(vrfs, scale['routes']).items()):
+        outputs['show ipv4 route %s' % vrf] = generate_routes(count, 'ipv4', seed)
+        outputs['show ipv6 route %s' % vrf] = generate_routes(count // 10, 'ipv6', seed)
+    for idx in range(scale['neighbors']):
+        outputs['show lldp detail sdn%d' % (12000 + idx)] = generate_lldp_detail(idx)
+    return outputs
+
+
+def write_fixtures(outdir, scale):
+    """Write outputs as fixture files (same naming as unit test fixtures)"""
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    for command, output in generate_outputs(scale).items():
+        with open(os.path.join(outdir, command.replace(' ', '_')), 'w', encoding='utf-8') as fd:
+            fd.write(output)
+
+
+if __name__ == '__main__':
+    # Run: python tests/benchmark/generator.py <outdir> [small|full]
+    write_fixtures(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else 'small')
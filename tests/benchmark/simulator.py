@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Local FreeRTR CLI stand-in for end-to-end benchmarks.
+
+FreeRTRShell answers commands with fixture files (tests/unit/modules/fixtures
+or generator.py output) like FreeRTR does: command echo, output and prompt
+(`rare#`, `rare(cfg)#` in configuration mode), `terminal length 0`,
+`[confirm yes/no]:` question of copy running-config startup-config, output
+filters (`| include`, `| exclude`, `| section`) and `% invalid input` for
+unknown commands. Every command waits for configured
+latency (default and per command) and is logged, so round trips can be
+counted.
+
+Shell can be served in two ways:
+
+    * serve() runs an SSH server (paramiko) for network_cli, so complete
+      ansible-playbook path (action plugin, terminal, cliconf, module) runs;
+    * SimConnection/SimRPC run cliconf and modules in-process: SimConnection
+      stands for network_cli (send with prompt/answer, terminal prompt and
+      error regexes), SimRPC for the persistent connection socket.
+"""
+import os
+import re
+import json
+import time
+import socket
+import threading
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.connection import ConnectionError
+from ansible.errors import AnsibleConnectionFailure
+from ansible_collections.sense.freertr.plugins.cliconf.freertr import Cliconf
+from ansible_collections.sense.freertr.plugins.terminal.freertr import TerminalModule
+
+try:
+    import paramiko
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'unit', 'modules', 'fixtures')
+
+CONFIRM = '[confirm yes/no]: '
+
+
+def load_fixtures(path=FIXTURES):
+    """Load fixture files as {command: output}"""
+    out = {}
+    for fname in os.listdir(path):
+        with open(os.path.join(path, fname), 'r', encoding='utf-8') as fd:
+            out[fname.replace('_', ' ')] = fd.read()
+    return out
+
+
+class FreeRTRShell:
+    """FreeRTR CLI session over known command outputs"""
+
+    def __init__(self, outputs, hostname='rare', latency=0.0, latencies=None, log=None):
+        self.outputs = outputs
+        self.hostname = hostname
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.log = log if log is not None else []
+        self.mode = 'exec'
+        self.confirm = None
+        self.config = []
+
+    def prompt(self):
+        """Current prompt"""
+        if self.mode == 'config':
+            return '%s(cfg)#' % self.hostname
+        return '%s#' % self.hostname
+
+    def banner(self):
+        """Login banner and first prompt"""
+        return 'welcome\r\nline ready\r\n%s' % self.prompt()
+
+    def wait(self, command):
+        """Sleep command latency"""
+        for prefix, latency in self.latencies.items():
+            if command.startswith(prefix):
+                time.sleep(latency)
+                return
+        if self.latency:
+            time.sleep(self.latency)
+
+    def execute(self, command):
+        """Execute command and return echo, output and next prompt"""
+        command = command.strip()
+        self.log.append((time.time(), command))
+        self.wait(command)
+        return '%s\r\n%s%s' % (command, self.output(command), '' if self.confirm else self.prompt())
+
+    def output(self, command):
+        """Return output of command (lines end with CRLF)"""
+        if self.confirm:
+            confirmed, self.confirm = self.confirm, None
+            if command in ['y', 'yes']:
+                return 'saving %s\r\n' % confirmed
+            return 'aborted\r\n'
+        if not command:
+            return ''
+        if command.startswith('terminal '):
+            return ''
+        if self.mode == 'config':
+            return self.configure(command)
+        if command in ['configure terminal', 'conf t']:
+            self.mode = 'config'
+            return ''
+        if command == 'copy running-config startup-config':
+            self.confirm = 'startup-config'
+            return CONFIRM
+        base, _, pipe = command.partition(' | ')
+        output = self.outputs.get(base.strip())
+        if output is None and base.startswith('show running-config'):
+            output = self.outputs.get('show running-config')
+        if output is not None and pipe:
+            output = self.pipe(output, pipe)
+        if output is None:
+            return '%% invalid input: %s\r\n' % command
+        return output.replace('\n', '\r\n')
+
+    @staticmethod
+    def pipe(output, pipe):
+        """Apply output filter (include, exclude, section), None if not known"""
+        name, _, regex = pipe.strip().partition(' ')
+        lines = output.split('\n')
+        if name == 'include':
+            return '\n'.join(line for line in lines if re.search(regex, line)) + '\n'
+        if name == 'exclude':
+            return '\n'.join(line for line in lines if not re.search(regex, line)) + '\n'
+        if name == 'section':
+            out = []
+            matched = False
+            for line in lines:
+                if line and not line.startswith(' '):
+                    matched = bool(re.search(regex, line))
+                if matched:
+                    out.append(line)
+            return '\n'.join(out) + '\n'
+        return None
+
+    def configure(self, command):
+        """Configuration mode command"""
+        if command in ['end', 'exit']:
+            self.mode = 'exec'
+            return ''
+        if command.startswith('fail'):
+            return '%% invalid input: %s\r\n' % command
+        self.config.append(command)
+        return ''
+
+
+class SimConnection:
+    """network_cli stand-in for cliconf: command/prompt/answer exchange with the
+    shell, prompt detection and error detection with terminal plugin regexes"""
+
+    def __init__(self, shell):
+        self.shell = shell
+        self.sent = 0
+        self._matched_prompt = shell.prompt()
+
+    def get_prompt(self):
+        """Last prompt"""
+        return to_bytes(self._matched_prompt)
+
+    def exchange(self, command):
+        """Send one line and return response"""
+        self.sent += 1
+        return to_bytes(self.shell.execute(to_text(command)))
+
+    def send(self, command, prompt=None, answer=None, sendonly=False, newline=True,
+             prompt_retry_check=False, check_all=False):
+        """Send command, answer prompts and return cleaned output"""
+        response = self.exchange(command)
+        prompts = prompt if isinstance(prompt, list) else [prompt] if prompt else []
+        answers = answer if isinstance(answer, list) else [answer] if answer else []
+        for idx, item in enumerate(prompts):
+            if re.search(to_bytes(item), response):
+                response += self.exchange(answers[min(idx, len(answers) - 1)] if answers else b'')
+        if sendonly:
+            return b''
+        for regex in TerminalModule.terminal_stderr_re:
+            if regex.search(response):
+                raise AnsibleConnectionFailure(to_text(response.strip(), errors='surrogate_or_strict'))
+        lines = response.split(b'\r\n')
+        matched = None
+        for regex in TerminalModule.terminal_stdout_re:
+            match = regex.search(lines[-1])
+            if match:
+                matched = lines[-1]
+                break
+        if matched is None:
+            raise AnsibleConnectionFailure('prompt not detected: %s' % to_text(lines[-1]))
+        self._matched_prompt = to_text(matched)
+        # Drop command echo and prompt
+        return b'\n'.join(lines[1:-1]).strip()
+
+
+class SimRPC:
+    """Persistent connection (module side Connection) stand-in: calls cliconf
+    methods in-process and converts failures into ConnectionError"""
+
+    def __init__(self, shell):
+        self.connection = SimConnection(shell)
+        self.cliconf = Cliconf(self.connection)
+        self.calls = 0
+
+    def exec_command(self, command):
+        """network_cli exec_command (json encoded dict or plain command)"""
+        try:
+            cmd = json.loads(command)
+        except ValueError:
+            cmd = None
+        if not isinstance(cmd, dict):
+            cmd = {'command': command}
+        return self.call(self.cliconf.send_command, command=cmd['command'],
+                         prompt=cmd.get('prompt'), answer=cmd.get('answer'))
+
+    def call(self, method, *args, **kwargs):
+        """Call cliconf method like JSON-RPC (text result, ConnectionError)"""
+        self.calls += 1
+        try:
+            out = method(*args, **kwargs)
+        except AnsibleConnectionFailure as ex:
+            raise ConnectionError(to_text(ex), code=1)
+        return to_text(out, errors='surrogate_or_strict') if isinstance(out, bytes) else out
+
+    def __getattr__(self, name):
+        method = getattr(self.cliconf, name)
+        return lambda *args, **kwargs: self.call(method, *args, **kwargs)
+
+
+if HAS_PARAMIKO:
+    class SSHServer(paramiko.ServerInterface):
+        """Accept any password, one interactive shell per session"""
+
+        def __init__(self):
+            self.ready = threading.Event()
+
+        def check_auth_password(self, username, password):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def get_allowed_auths(self, username):
+            return 'password'
+
+        def check_channel_request(self, kind, chanid):
+            if kind == 'session':
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            self.ready.set()
+            return True
+
+
+def run_session(channel, shell):
+    """Read command lines from SSH channel and write shell responses"""
+    channel.sendall(to_bytes(shell.banner()))
+    data = b''
+    while True:
+        chunk = channel.recv(4096)
+        if not chunk:
+            return
+        data += chunk
+        while b'\r' in data or b'\n' in data:
+            end = min(idx for idx in [data.find(b'\r'), data.find(b'\n')] if idx != -1)
+            line, data = data[:end], data[end + 1:].lstrip(b'\n')
+            channel.sendall(to_bytes(shell.execute(to_text(line))))
+
+
+def serve(outputs, host='127.0.0.1', port=0, log=None, **kwargs):
+    """Serve FreeRTR shell over SSH in background threads.
+    Returns (listening socket, port). kwargs are FreeRTRShell options"""
+    if not HAS_PARAMIKO:
+        raise RuntimeError('paramiko is required to serve simulator over SSH')
+    hostKey = paramiko.RSAKey.generate(2048)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(16)
+
+    def handle(client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(hostKey)
+        server = SSHServer()
+        transport.start_server(server=server)
+        channel = transport.accept(30)
+        if channel is None or not server.ready.wait(30):
+            transport.close()
+            return
+        try:
+            run_session(channel, FreeRTRShell(outputs, log=log, **kwargs))
+        finally:
+            transport.close()
+
+    def accept():
+        while True:
+            try:
+                client, _addr = sock.accept()
+            except OSError:
+                return
+            worker = threading.Thread(target=handle, args=(client,), name='freertr-sim')
+            worker.daemon = True
+            worker.start()
+
+    acceptor = threading.Thread(target=accept, name='freertr-sim-accept')
+    acceptor.daemon = True
+    acceptor.start()
+    return sock, sock.getsockname()[1]
+
+
+if __name__ == '__main__':
+    # Run: python tests/benchmark/simulator.py [port] [latency]
+    import sys
+    _sock, simPort = serve(load_fixtures(), port=int(sys.argv[1]) if len(sys.argv) > 1 else 2222,
+                           latency=float(sys.argv[2]) if len(sys.argv) > 2 else 0.0)
+    print('FreeRTR simulator listening on 127.0.0.1:%d' % simPort)
+    while True:
+        time.sleep(3600)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import os
+import unittest
+
+from ansible_collections.sense.freertr.tests.benchmark.generator import generate_outputs, SCALES
+from ansible_collections.sense.freertr.tests.benchmark.bench_parsers import populate, run_suite, compare, load_baseline
+from ansible_collections.sense.freertr.tests.benchmark.bench_parsers import Interfaces, Routing
+
+
+class TestFreeRTRBenchmark(unittest.TestCase):
+
+    def test_generated_outputs_parse(self):
+        scale = {'interfaces': 3, 'subinterfaces': 2, 'vrfs': 2, 'routes': 101, 'neighbors': 2}
+        outputs = generate_outputs(scale)
+        facts = populate(Interfaces, outputs).facts
+        self.assertEqual(9, len(facts['interfaces']))
+        self.assertEqual(['sdn12000'], facts['interfaces']['sdn12000.100']['tagged'])
+        self.assertEqual(30, facts['interfaces']['sdn12000.101']['ipv4'][0]['masklen'])
+        self.assertEqual('host-1.example.org', facts['lldp']['sdn12001']['remote_system_name'])
+        facts = populate(Routing, outputs).facts
+        self.assertEqual({'vrf0': 51, 'vrf1': 50}, dict((vrf, facts['vrfs'][vrf]['uni']['v4']) for vrf in facts['vrfs']))
+        self.assertEqual(101, len(facts['ipv4']))
+        self.assertEqual(10, len(facts['ipv6']))
+
+    @unittest.skipUnless(os.environ.get('FREERTR_BENCHMARK'), 'set FREERTR_BENCHMARK=<scale> to run benchmark')
+    def test_no_regression(self):
+        scale = os.environ['FREERTR_BENCHMARK']
+        self.assertIn(scale, SCALES)
+        self.assertEqual([], compare(run_suite(scale), load_baseline().get(scale, {})))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import time
+import unittest
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.sense.freertr.tests.benchmark.simulator import FreeRTRShell, SimRPC, load_fixtures
+from ansible_collections.sense.freertr.tests.benchmark.bench_e2e import run_suite, compare, load_baseline, run_inprocess
+
+
+class TestFreeRTRSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.shell = FreeRTRShell(load_fixtures())
+
+    def test_shell_prompts(self):
+        self.assertTrue(self.shell.banner().endswith('rare#'))
+        self.assertEqual('terminal length 0\r\nrare#', self.shell.execute('terminal length 0'))
+        self.assertTrue(self.shell.execute('configure terminal').endswith('rare(cfg)#'))
+        self.assertTrue(self.shell.execute('end').endswith('\r\nrare#'))
+        self.assertTrue(self.shell.execute('copy running-config startup-config').endswith('[confirm yes/no]: '))
+        self.assertEqual('yes\r\nsaving startup-config\r\nrare#', self.shell.execute('yes'))
+        self.assertIn('% invalid input', self.shell.execute('show nothing'))
+        self.assertEqual(6, len(self.shell.log))
+
+    def test_latency(self):
+        shell = FreeRTRShell(load_fixtures(), latency=0.05, latencies={'show ipv4': 0})
+        start = time.perf_counter()
+        shell.execute('show ipv4 interface')
+        self.assertLess(time.perf_counter() - start, 0.05)
+        shell.execute('show platform')
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+    def test_rpc(self):
+        rpc = SimRPC(self.shell)
+        out = rpc.run_commands(commands=['show platform', {'command': 'copy running-config startup-config',
+                                                           'prompt': r'\[confirm yes/no\]:\s?$', 'answer': 'yes'}])
+        self.assertIn('hwid: accton_as9516_32d', out[0])
+        self.assertIn('saving startup-config', out[1])
+        self.assertEqual('rare', rpc.get_device_info()['network_os_hostname'])
+        self.assertRaises(ConnectionError, rpc.run_commands, commands=['show nothing'])
+
+    def test_e2e_round_trips(self):
+        results = run_suite('inprocess')
+        baseline = load_baseline()
+        self.assertEqual([], compare(results, baseline['inprocess'], baseline['inprocess_rpcs']))
+
+    def test_config_digest(self):
+        rpc = SimRPC(self.shell)
+        args = {'src': 'interface ethernet1\n description out of band management port\n exit\n', 'digest': True}
+        self.assertFalse(run_inprocess('freertr_config', args, rpc)['changed'])
+        sent = len(self.shell.log)
+        result = run_inprocess('freertr_config', args, rpc)
+        self.assertEqual('unchanged', result['digest'])
+        self.assertEqual(sent, len(self.shell.log))
+        run_inprocess('freertr_config', {'lines': ['description test'], 'parents': ['interface ethernet2']}, rpc)
+        sent = len(self.shell.log)
+        self.assertNotIn('digest', run_inprocess('freertr_config', args, rpc))
+        self.assertLess(sent, len(self.shell.log))
+
+    def test_config_fetched_once(self):
+        rpc = SimRPC(self.shell)
+        args = {'src': 'hostname rare\n'}
+        for _ in range(3):
+            self.assertFalse(run_inprocess('freertr_config', args, rpc)['changed'])
+        self.assertEqual(1, [command for _, command in self.shell.log].count('show running-config'))
+        self.assertEqual({'hit': 2, 'miss': 1}, rpc.get_config_stats())
+
+    def test_cached_config_not_counted_as_sent(self):
+        rpc = SimRPC(self.shell)
+        args = {'gather_subset': ['config']}
+        first = run_inprocess('freertr_facts', args, rpc)
+        self.assertIn('show running-config', first['commands_sent'])
+        second = run_inprocess('freertr_facts', args, rpc)
+        self.assertNotIn('show running-config', second['commands_sent'])
+        self.assertEqual(first['ansible_facts']['ansible_net_config'], second['ansible_facts']['ansible_net_config'])
+        self.assertEqual(1, [command for _, command in self.shell.log].count('show running-config'))
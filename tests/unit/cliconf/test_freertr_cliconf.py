@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import unittest
+from unittest.mock import MagicMock
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible_collections.sense.freertr.plugins.cliconf.freertr import Cliconf
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+class TestFreeRTRCliconf(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.send.side_effect = self.send
+        self.cliconf = Cliconf(self.connection)
+
+    @staticmethod
+    def send(command, **kwargs):
+        command = command.decode()
+        if command.startswith('fail'):
+            raise AnsibleConnectionFailure('invalid input: %s' % command)
+        if not command.startswith('show '):
+            return b''
+        return load_fixture(command.replace(' ', '_')).encode()
+
+    def test_run_commands_batched(self):
+        out = self.cliconf.run_commands(['show platform', {'command': 'show ipv4 interface'}])
+        self.assertEqual(2, len(out))
+        self.assertIn('hwid: accton_as9516_32d', out[0])
+        self.assertIn('ethernet1', out[1])
+        self.assertEqual(2, self.connection.send.call_count)
+
+    def test_run_commands_prompt_answer(self):
+        self.cliconf.run_commands([{'command': 'show platform', 'prompt': 'yes/no', 'answer': 'yes'}])
+        kwargs = self.connection.send.call_args[1]
+        self.assertEqual(b'yes/no', kwargs['prompt'])
+        self.assertEqual(b'yes', kwargs['answer'])
+
+    def test_run_commands_check_rc(self):
+        with self.assertRaises(AnsibleConnectionFailure):
+            self.cliconf.run_commands(['show platform', 'fail me'])
+        out = self.cliconf.run_commands(['show platform', {'command': 'fail me', 'check_rc': False}])
+        self.assertIn('invalid input', out[1])
+        out = self.cliconf.run_commands(['fail me'], check_rc=False)
+        self.assertIn('invalid input', out[0])
+
+    def test_edit_config_single_rpc(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        resp = self.cliconf.edit_config(['interface ethernet1', ' description test',
+                                         {'command': 'no interface x', 'prompt': 'yes/no', 'answer': 'yes'}])
+        sent = [call[1]['command'] for call in self.connection.send.call_args_list]
+        self.assertEqual([b'configure terminal', b'interface ethernet1', b' description test', b'no interface x', b'end'],
+                         sent)
+        self.assertEqual(b'yes', self.connection.send.call_args_list[3][1]['answer'])
+        self.assertEqual([], resp['errors'])
+
+    def test_edit_config_errors(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        resp = self.cliconf.edit_config(['interface ethernet1', 'fail one', 'fail two'], stop_on_error=False)
+        self.assertEqual([2, 3], [item['line'] for item in resp['errors']])
+        self.assertIn('invalid input: fail one', resp['errors'][0]['error'])
+        resp = self.cliconf.edit_config(['fail one', 'interface ethernet1'])
+        self.assertEqual(1, len(resp['errors']))
+        self.assertEqual(b'end', self.connection.send.call_args[1]['command'])
+        self.assertNotIn(b'interface ethernet1', [call[1]['command'] for call in self.connection.send.call_args_list[-3:]])
+
+    def test_config_digests(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        self.cliconf.set_config_digests('run1', ['a', 'b'])
+        self.cliconf.set_config_digests('run1', ['c'])
+        self.assertEqual({'running': 'run1', 'blocks': ['a', 'b', 'c']}, self.cliconf.get_config_digests())
+        self.cliconf.set_config_digests('run2', ['d'])
+        self.assertEqual(['d'], self.cliconf.get_config_digests()['blocks'])
+        self.cliconf.run_commands(['show platform'])
+        self.assertEqual(['d'], self.cliconf.get_config_digests()['blocks'])
+        self.cliconf.run_commands(['clear counters'])
+        self.assertEqual({'running': None, 'blocks': []}, self.cliconf.get_config_digests())
+        self.cliconf.set_config_digests('run2', ['d'])
+        self.cliconf.edit_config(['hostname rare'])
+        self.assertEqual([], self.cliconf.get_config_digests()['blocks'])
+
+    def test_running_config_cache(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        first = self.cliconf.run_commands(['show running-config'])[0]
+        self.assertEqual(first, self.cliconf.run_commands(['show running-config'])[0])
+        self.assertEqual(first, self.cliconf.get_running_config())
+        self.assertEqual({'hit': 2, 'miss': 1}, self.cliconf.get_config_stats())
+        self.assertEqual(1, self.connection.send.call_count)
+        self.cliconf.edit_config(['hostname rare'])
+        self.cliconf.run_commands(['show running-config'])
+        self.cliconf.run_commands(['clear counters', 'show running-config'])
+        self.assertEqual({'hit': 2, 'miss': 3}, self.cliconf.get_config_stats())
+        reply = self.cliconf.run_commands(['show running-config', 'clear counters', 'show running-config'],
+                                          sources=True)
+        self.assertEqual([True, False, False], reply['cached'])
+        self.assertEqual(3, len(reply['responses']))
+
+    def test_platform_invalidated(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        self.assertIn('hwid: accton_as9516_32d', self.cliconf.get_platform())
+        self.assertEqual('rare', self.cliconf.get_device_info()['network_os_hostname'])
+        self.cliconf.run_commands(['show interfaces'])
+        self.cliconf.get_device_info()
+        self.assertEqual(2, self.connection.send.call_count)
+        self.cliconf.edit_config(['hostname rare2'])
+        self.cliconf.get_device_info()
+        self.cliconf.run_commands(['clear counters'])
+        self.cliconf.get_platform()
+        sent = [call[1]['command'] for call in self.connection.send.call_args_list]
+        self.assertEqual(3, sent.count(b'show platform'))
+
+    def test_running_config_kept_until_write(self):
+        self.connection.get_prompt.return_value = b'rare#'
+        first = self.cliconf.get_running_config()
+        self.assertEqual(first, self.cliconf.get_running_config())
+        self.cliconf.get('show platform')
+        self.cliconf.get_running_config()
+        self.assertEqual({'hit': 2, 'miss': 1}, self.cliconf.get_config_stats())
+        self.cliconf.get('clear counters')
+        self.cliconf.get_running_config()
+        self.assertEqual({'hit': 2, 'miss': 2}, self.cliconf.get_config_stats())
+        sent = [call[1]['command'] for call in self.connection.send.call_args_list]
+        self.assertEqual(2, sent.count(b'show running-config'))
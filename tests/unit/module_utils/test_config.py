@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import NetworkConfig
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import dumps as netDumps
+from ansible_collections.sense.freertr.plugins.module_utils.network.config import FreeRTRConfig, dumps
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+CANDIDATES = [
+    (['description out of band management port', 'vrf forwarding oob'], ['interface ethernet1']),
+    (['description changed', 'macaddr 0001.0bad.c0de'], ['interface ethernet1']),
+    (['description new port', 'no shutdown'], ['interface ethernet99']),
+    (['sequence 10 permit 0.0.0.0/0 ge 0 le 0'], ['prefix-list all4']),
+    (['hostname rare', 'hostname other'], []),
+]
+
+
+def withoutExit(config):
+    """Running config without exit lines (netcommon keeps them as children)"""
+    return '\n'.join(line for line in config.split('\n') if line.strip() not in ['exit', 'end'])
+
+
+class TestFreeRTRConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.running = load_fixture('show_running-config')
+        self.config = FreeRTRConfig(self.running)
+
+    def test_parse(self):
+        obj = self.config.get_object(['interface ethernet1', 'vrf forwarding oob'])
+        self.assertEqual(['interface ethernet1'], obj.parents)
+        self.assertNotIn('exit', [item.text for item in self.config])
+        block = self.config.get_block(['prefix-list all4'])
+        self.assertEqual(['prefix-list all4', 'sequence 10 permit 0.0.0.0/0 ge 0 le 0'], dumps(block))
+        self.assertRaises(ValueError, self.config.get_block, ['interface ethernet99'])
+
+    def test_nested(self):
+        config = FreeRTRConfig('router bgp4 1\n vrf v1\n neighbor 1.1.1.1\n  remote-as 2\n  exit\n exit\n')
+        obj = config.get_object(['router bgp4 1', 'neighbor 1.1.1.1', 'remote-as 2'])
+        self.assertEqual(['router bgp4 1', 'neighbor 1.1.1.1'], obj.parents)
+        self.assertEqual(4, len(config))
+
+    def test_add(self):
+        self.config.add(['description new port'], parents=['interface ethernet99'])
+        self.config.add(['description new port', 'exit'], parents=['interface ethernet99'])
+        self.assertEqual(['interface ethernet99', 'description new port'],
+                         dumps(self.config.get_block(['interface ethernet99'])))
+
+    def test_same_as_netcommon(self):
+        net = NetworkConfig(contents=withoutExit(self.running), indent=1)
+        for lines, parents in CANDIDATES:
+            ours = FreeRTRConfig()
+            ours.add(lines, parents=parents)
+            theirs = NetworkConfig(indent=1)
+            theirs.add(lines, parents=parents)
+            for match in ['line', 'strict', 'exact']:
+                for replace in ['line', 'block']:
+                    expected = netDumps(theirs.difference(net, match=match, path=parents, replace=replace),
+                                        'commands')
+                    result = dumps(ours.difference(self.config, match=match, path=parents, replace=replace))
+                    self.assertEqual(expected.split('\n') if expected else [], result,
+                                     '%s %s %s' % (parents, match, replace))
+
+    def test_difference(self):
+        candidate = FreeRTRConfig()
+        candidate.add(['description changed', 'vrf forwarding oob'], parents=['interface ethernet1'])
+        self.assertEqual(['interface ethernet1', 'description changed'],
+                         dumps(candidate.difference(self.config)))
+        self.assertEqual(['interface ethernet1', 'description changed', 'vrf forwarding oob'],
+                         dumps(candidate.difference(self.config, match='exact', path=['interface ethernet1'])))
+        self.assertRaises(ValueError, candidate.difference, self.config, match='bad')
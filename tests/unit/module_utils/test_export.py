@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import os
+import gzip
+import json
+import shutil
+import hashlib
+import tempfile
+import unittest
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.export import Exports
+
+
+class TestFreeRTRExport(unittest.TestCase):
+
+    def setUp(self):
+        self.exportDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.exportDir)
+
+    def checkFile(self, entry, records):
+        with open(entry['path'], 'rb') as fd:
+            data = fd.read()
+        self.assertEqual(hashlib.sha256(data).hexdigest(), entry['sha256'])
+        if entry['compressed']:
+            data = gzip.decompress(data)
+        self.assertEqual(records, [json.loads(line) for line in data.decode('utf-8').splitlines()])
+        self.assertEqual(len(records), entry['records'])
+
+    def test_ndjson(self):
+        records = [{'vrf': 'oob', 'from': '10.0.0.%d/32' % idx} for idx in range(100)]
+        exports = Exports(self.exportDir, 'sdn1')
+        entry = exports.write('ipv4', iter(records))
+        self.assertEqual({'ipv4': entry}, exports.manifest)
+        self.assertTrue(entry['path'].endswith('.ipv4.ndjson'))
+        self.checkFile(entry, records)
+        self.assertEqual([os.path.basename(entry['path'])], os.listdir(self.exportDir))
+
+    def test_gzip(self):
+        records = [{'vrf': 'oob', 'from': 'fe80::%d/128' % idx} for idx in range(100)]
+        first = Exports(self.exportDir, 'sdn1', compress=True).write('ipv6', records)
+        self.assertTrue(first['path'].endswith('.ipv6.ndjson.gz'))
+        self.checkFile(first, records)
+        # Same records give same file and digest
+        second = Exports(self.exportDir, 'sdn1', compress=True).write('ipv6', records)
+        self.assertEqual(first, second)
+
+    def test_failed_write(self):
+        def records():
+            yield {'from': '10.0.0.0/8'}
+            raise ValueError('parse error')
+        exports = Exports(self.exportDir, 'sdn1')
+        with self.assertRaises(ValueError):
+            exports.write('ipv4', records())
+        self.assertEqual({}, exports.manifest)
+        self.assertEqual([], os.listdir(self.exportDir))
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.filters import pushDown, splitPipe, apply, tableRows
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+class TestFreeRTRFilters(unittest.TestCase):
+
+    def test_push_down(self):
+        self.assertEqual('show interfaces', pushDown('show interfaces'))
+        self.assertEqual('show interfaces | include sdn', pushDown('show interfaces', include='sdn'))
+        self.assertEqual(('show interfaces', 'exclude', 'sdn'),
+                         splitPipe(pushDown('show interfaces', exclude='sdn')))
+        self.assertEqual(('show x | count', None, None), splitPipe('show x | count'))
+
+    def test_apply(self):
+        data = 'a1\nb1\nab2\n'
+        self.assertEqual(data, apply(data, None, None))
+        self.assertEqual('a1\nab2\n', apply(data, *splitPipe(pushDown('x', include='a'))[1:]))
+        self.assertEqual('b1\n', apply(data, *splitPipe(pushDown('x', exclude='a'))[1:]))
+        self.assertEqual('a1\n', apply(data, *splitPipe(pushDown('x', include='a', exclude='b'))[1:]))
+
+    def test_table_rows(self):
+        data = load_fixture('show_ipv4_route_oob')
+        lines = apply(data, 'include', tableRows('typ', ['C'])).splitlines()
+        self.assertTrue(lines[0].startswith('typ '))
+        self.assertTrue(all(line.startswith('C ') for line in lines[1:]))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import unittest
+from unittest.mock import MagicMock
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import run_commands, get_config, get_planner, load_config
+from ansible_collections.sense.freertr.plugins.module_utils.network.freertr import get_section_config
+
+
+class TestFreeRTRCommandPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.module = MagicMock()
+        self.connection = MagicMock()
+        self.connection.run_commands.side_effect = self.reply
+        self.connection.get_platform.return_value = 'platform output'
+        self.module._freertr_connection = self.connection
+        del self.module._freertr_planner
+
+    @staticmethod
+    def reply(commands, check_rc=True, sources=False):
+        responses = ['%s output' % cmd['command'] for cmd in commands]
+        if sources:
+            return {'responses': responses, 'cached': [False] * len(commands)}
+        return responses
+
+    def sent(self):
+        return [cmd['command'] for call in self.connection.run_commands.call_args_list
+                for cmd in call[1]['commands']]
+
+    def test_memoize_deduplicates(self):
+        out = run_commands(self.module, ['show interfaces', 'show interfaces'], memoize=True)
+        self.assertEqual(['show interfaces output'] * 2, out)
+        out = run_commands(self.module, ['show ipv4 interface', 'show interfaces'], memoize=True)
+        self.assertEqual(['show ipv4 interface output', 'show interfaces output'], out)
+        self.assertEqual(['show interfaces', 'show ipv4 interface'], self.sent())
+        self.assertEqual(self.sent(), get_planner(self.module).sent)
+        self.assertEqual(2, get_planner(self.module).stats['memo'])
+
+    def test_route_tables_not_memoized(self):
+        out = run_commands(self.module, ['show ipv4 route oob', 'show interfaces'], memoize=True)
+        self.assertEqual(['show ipv4 route oob output', 'show interfaces output'], out)
+        self.assertEqual(['show interfaces'], list(get_planner(self.module).memo))
+        run_commands(self.module, ['show ipv4 route oob', 'show interfaces'], memoize=True)
+        self.assertEqual(['show ipv4 route oob', 'show interfaces', 'show ipv4 route oob'], self.sent())
+
+    def test_memo_hit_with_write_in_batch(self):
+        run_commands(self.module, ['show interfaces'], memoize=True)
+        out = run_commands(self.module, ['clear counters', 'show interfaces'], memoize=True)
+        self.assertEqual(['clear counters output', 'show interfaces output'], out)
+        self.assertEqual({}, get_planner(self.module).memo)
+
+    def test_without_memoize_always_sent(self):
+        run_commands(self.module, ['show interfaces'])
+        run_commands(self.module, ['show interfaces'])
+        self.assertEqual(['show interfaces', 'show interfaces'], self.sent())
+
+    def test_platform_from_connection(self):
+        self.assertEqual(['platform output'], run_commands(self.module, ['show platform'], memoize=True))
+        self.assertEqual([], self.sent())
+        self.connection.get_platform.side_effect = ConnectionError('not supported')
+        del self.module._freertr_planner
+        self.assertEqual(['show platform output'], run_commands(self.module, ['show platform'], memoize=True))
+
+    def test_config_shared_and_invalidated(self):
+        run_commands(self.module, ['show running-config'], memoize=True)
+        self.assertEqual('show running-config output', get_config(self.module))
+        self.assertEqual(['show running-config'], self.sent())
+        run_commands(self.module, ['clear counters'], memoize=True)
+        get_config(self.module)
+        self.assertEqual(['show running-config', 'clear counters', 'show running-config'], self.sent())
+
+    def test_cached_config_not_sent(self):
+        self.connection.run_commands.side_effect = None
+        self.connection.run_commands.return_value = {'responses': ['config'], 'cached': [True]}
+        self.assertEqual('config', get_config(self.module))
+        planner = get_planner(self.module)
+        self.assertEqual([], planner.sent)
+        self.assertEqual(1, planner.stats['connection'])
+        self.assertEqual(1, self.connection.run_commands.call_count)
+        self.assertTrue(self.connection.run_commands.call_args[1]['sources'])
+
+    def test_load_config_single_rpc(self):
+        self.connection.edit_config.return_value = {'request': [], 'response': [], 'errors': []}
+        run_commands(self.module, ['show running-config'], memoize=True)
+        load_config(self.module, ['interface ethernet1', {'command': 'no shutdown', 'prompt': 'y/n', 'answer': 'y'}])
+        self.assertEqual(1, self.connection.edit_config.call_count)
+        self.assertEqual({}, get_planner(self.module).memo)
+        self.module.fail_json.assert_not_called()
+        self.connection.edit_config.return_value = {'errors': [{'line': 2, 'command': 'bad', 'error': 'invalid input'}]}
+        load_config(self.module, ['interface ethernet1', 'bad'])
+        self.assertIn('line 2 (bad): invalid input', self.module.fail_json.call_args[1]['msg'])
+
+    def test_section_config(self):
+        self.connection.run_commands.side_effect = None
+        self.connection.run_commands.return_value = {'responses': ['interface ethernet1\n description one\n exit\n!\n'
+                                                                   'interface ethernet10\n description ten\n exit\n'],
+                                                     'cached': [False]}
+        self.assertEqual('interface ethernet1\n description one',
+                         get_section_config(self.module, ['interface ethernet1']))
+        self.assertEqual('show running-config | section interface ethernet1', self.sent()[0])
+        self.connection.run_commands.return_value = {'responses': [''], 'cached': [False]}
+        self.assertEqual('', get_section_config(self.module, ['interface ethernet2']))
+        self.connection.run_commands.side_effect = ConnectionError('invalid input')
+        self.assertIsNone(get_section_config(self.module, ['interface ethernet3']))
+
+    def test_section_config_unfiltered(self):
+        self.connection.run_commands.side_effect = None
+        self.connection.run_commands.return_value = {'responses': ['hostname rare\n!\n'
+                                                                   'interface ethernet1\n description one\n exit\n'],
+                                                     'cached': [False]}
+        self.assertIsNone(get_section_config(self.module, ['interface ethernet1']))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import time
+import threading
+import unittest
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.pipeline import Pipeline
+
+
+class TestFreeRTRPipeline(unittest.TestCase):
+
+    def test_jobs_run_in_order_in_worker(self):
+        done = []
+        pipeline = Pipeline()
+        for idx in range(5):
+            pipeline.submit(lambda idx=idx: done.append((idx, threading.current_thread().name)))
+        pipeline.close()
+        self.assertEqual([0, 1, 2, 3, 4], [item[0] for item in done])
+        self.assertEqual({'freertr-parser'}, set(item[1] for item in done))
+
+    def test_io_overlaps_parsing(self):
+        pipeline = Pipeline()
+        start = time.perf_counter()
+        for _ in range(4):
+            time.sleep(0.05)  # I/O in caller thread
+            pipeline.submit(lambda: time.sleep(0.05))  # parsing in worker
+        pipeline.close()
+        self.assertLess(time.perf_counter() - start, 0.39)
+
+    def test_worker_error_is_raised(self):
+        done = []
+
+        def fail():
+            raise SystemExit(1)
+        pipeline = Pipeline()
+        pipeline.submit(fail)
+        pipeline.submit(lambda: done.append(1))
+        with self.assertRaises(SystemExit):
+            pipeline.close()
+        self.assertEqual([], done)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import random
+import sys
+import unittest
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.radix import RadixTrie, parsePrefix
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+def linearLookup(prefixes, width, key, length):
+    """Longest prefix match by scanning all prefixes"""
+    best, bestLen = -1, -1
+    for pkey, plen, value in prefixes:
+        if plen <= length and key >> (width - plen) == pkey >> (width - plen) and plen > bestLen:
+            best, bestLen = value, plen
+    return best
+
+
+class TestFreeRTRRadix(unittest.TestCase):
+
+    def test_parse_prefix(self):
+        self.assertEqual(('ipv4', 0x0a000000, 8), parsePrefix('10.1.2.3/8'))
+        self.assertEqual(('ipv6', 0x20010db8 << 96, 32), parsePrefix('2001:db8::/32'))
+        self.assertEqual(('ipv4', 0, 0), parsePrefix('0.0.0.0/0'))
+        self.assertRaises(ValueError, parsePrefix, '10.0.0.0/33')
+        self.assertRaises(ValueError, parsePrefix, 'bad')
+
+    def test_same_as_linear(self):
+        rnd = random.Random(7)
+        for width in [32, 128]:
+            prefixes = []
+            for value in range(2000):
+                length = rnd.randint(0, width)
+                key = rnd.getrandbits(width)
+                if prefixes and rnd.random() < 0.5:
+                    # Nested and sibling prefixes of known ones
+                    key = prefixes[rnd.randrange(len(prefixes))][0] ^ rnd.getrandbits(max(1, width - length))
+                prefixes.append((key >> (width - length) << (width - length), length, value))
+            trie = RadixTrie(width).build(prefixes)
+            self.assertLess(len(trie), 2 * len(prefixes) + 1)
+            for _ in range(2000):
+                key = prefixes[rnd.randrange(len(prefixes))][0] | rnd.getrandbits(8)
+                length = rnd.choice([width, rnd.randint(0, width)])
+                self.assertEqual(linearLookup(prefixes, width, key, length), trie.lookup(key, length))
+
+    def test_route_table(self):
+        table = RouteTable('oob', 'ipv4').parse(load_fixture('show_ipv4_route_oob'))
+        trie = RadixTrie.fromTable(table)
+        route = table.route(trie.lookup(*parsePrefix('172.16.1.35')[1:]))
+        self.assertEqual(('REM', '172.16.1.35/32'), (route.typ, route.prefix))
+        self.assertEqual('172.16.0.0/23', table.route(trie.lookup(*parsePrefix('172.16.0.0/24')[1:])).prefix)
+        self.assertEqual('DEF', table.route(trie.lookup(*parsePrefix('8.8.8.8')[1:])).typ)
+        self.assertEqual(-1, RadixTrie().lookup(1))
+
+    def test_nbytes_counts_keys(self):
+        trie = RadixTrie(128).build((((idx + 1) << 64, 64, idx) for idx in range(100)))
+        arrays = sum(col.itemsize * len(col) for col in [trie.lens, trie.left, trie.right, trie.values])
+        self.assertGreaterEqual(trie.nbytes(), arrays + sys.getsizeof(trie.keys) + 100 * sys.getsizeof(1 << 64))
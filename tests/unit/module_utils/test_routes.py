@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import os
+import unittest
+import tracemalloc
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable, RouteFilter, ROUTE_BYTES_CEILING
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import parseAge, parseMetric
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+def synthetic_routes(count):
+    """Generate show ipv4 route output with count routes"""
+    lines = ['typ  prefix            metric  iface     hop         time']
+    for idx in range(count):
+        lines.append('B    %d.%d.%d.0/24  20/%d  sdn%d  10.0.%d.1  %dd%dh' % (
+            1 + (idx >> 16) % 223, (idx >> 8) & 255, idx & 255, idx % 7, idx % 32, idx % 64, idx % 30, idx % 24))
+    return '\n'.join(lines)
+
+
+class TestFreeRTRRoutes(unittest.TestCase):
+
+    def test_parse_fixture(self):
+        table = RouteTable('oob', 'ipv4').parse(load_fixture('show_ipv4_route_oob'))
+        self.assertEqual(4, len(table))
+        route = table.route(0)
+        self.assertEqual('DEF', route.typ)
+        self.assertEqual('0.0.0.0/0', route.prefix)
+        self.assertEqual((0, 2), (route.distance, route.metric))
+        self.assertEqual('172.16.1.35', route.hop)
+        self.assertEqual(18 * 3600 + 86400, route.age)
+        self.assertEqual({'vrf': 'oob', 'intf': 'ethernet1', 'from': '172.16.0.0/23'}, table.route(1).toFacts())
+        self.assertEqual(0xac100000, table.network(1))
+
+    def test_parse_ipv6_and_empty(self):
+        table = RouteTable('oob', 'ipv6').parse(load_fixture('show_ipv6_route_oob'))
+        self.assertEqual(['fe80::/64', 'fe80::201:bff:fead:c0de/128'], [route.prefix for route in table])
+        self.assertEqual(0, len(RouteTable('p4', 'ipv6').parse(load_fixture('show_ipv6_route_p4'))))
+
+    def test_filter_prefix_length(self):
+        routeFilter = RouteFilter(prefixes=['172.16.0.0/12'])
+        table = RouteTable('oob', 'ipv4', routeFilter).parse(load_fixture('show_ipv4_route_oob'))
+        self.assertEqual(['172.16.0.0/23', '172.16.1.35/32', '172.16.1.225/32'], [route.prefix for route in table])
+        for prefix in ['10.0.0.0/-5', '10.0.0.0/33', '2001:db8::/129', 'fe80::/-1']:
+            with self.assertRaises(ValueError) as ctx:
+                RouteFilter(prefixes=[prefix])
+            self.assertIn('bad prefix length %s' % prefix, str(ctx.exception))
+        RouteFilter(prefixes=['0.0.0.0/0', '10.0.0.1/32', '2001:db8::/128'])
+
+    def test_helpers(self):
+        self.assertEqual(13 * 60 + 17, parseAge('00:13:17'))
+        self.assertEqual(2 * 604800 + 3 * 86400, parseAge('2w3d'))
+        self.assertEqual(0, parseAge('never'))
+        self.assertEqual((20, 100), parseMetric('20/100'))
+
+    def test_memory_ceiling(self):
+        """Traced peak memory of parsing must stay below ROUTE_BYTES_CEILING per route.
+        Scale can be raised with FREERTR_ROUTE_SCALE (tracing 1M routes is slow)"""
+        count = int(os.environ.get('FREERTR_ROUTE_SCALE', 100000))
+        data = synthetic_routes(count)
+        tracemalloc.start()
+        try:
+            table = RouteTable('default', 'ipv4').parse(data)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, len(table))
+        self.assertLess(peak / count, ROUTE_BYTES_CEILING)
+
+    @unittest.skipUnless(os.environ.get('FREERTR_BENCHMARK'), 'set FREERTR_BENCHMARK=<scale> to run benchmark')
+    def test_memory_ceiling_1m(self):
+        """Traced memory kept by a parsed 1M route table (columns plus interned values)"""
+        count = 1000000
+        data = synthetic_routes(count)
+        tracemalloc.start()
+        try:
+            table = RouteTable('default', 'ipv4').parse(data)
+            current, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, len(table))
+        self.assertLess(current / count, ROUTE_BYTES_CEILING)
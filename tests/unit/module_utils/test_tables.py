@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.sense.freertr.plugins.module_utils.network.tables import Table, iterLines
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import load_fixture
+
+
+class TestFreeRTRTables(unittest.TestCase):
+
+    def test_iter_lines(self):
+        self.assertEqual(['a', '', 'b'], list(iterLines('a\n\nb\n')))
+
+    def test_empty_cells(self):
+        data = ('interface  state  address         netmask\n'
+                'ethernet1  up     172.16.1.225    255.255.254.0\n'
+                'ethernet2  down\n'
+                'ethernet3         10.0.0.1        255.0.0.0\n')
+        table = Table(data)
+        self.assertEqual(['interface', 'state', 'address', 'netmask'], table.columns)
+        self.assertEqual([('ethernet1', '172.16.1.225'), ('ethernet2', ''), ('ethernet3', '10.0.0.1')],
+                         list(table.rows([0, 2])))
+
+    def test_misaligned_rows(self):
+        table = Table(load_fixture('show_lldp_neighbor'))
+        rows = list(table.records())
+        self.assertEqual(3, len(rows))
+        self.assertEqual('sdn-sc-05.ultra.org', rows[0]['hostname'])
+        self.assertEqual('b859.9fed.298e', rows[0]['iface'])
+        table = Table('name  value\nfoo   bar baz\n x  y\nfoo    bar baz\n')
+        self.assertEqual([('foo', 'bar baz'), ('x', 'y')], list(table))
+        self.assertEqual(1, table.skipped)
+
+    def test_grouped_header(self):
+        table = Table(load_fixture('show_vrf_routing'), headers=2)
+        self.assertEqual(('uni',), table.groups[table.index('v4', 'uni')])
+        self.assertEqual((), table.groups[table.index('rd')])
+        self.assertEqual(4, table.index('v4', 'uni'))
+        rows = list(table)
+        self.assertEqual(['lin', 'oob', 'p4'], [row[0] for row in rows])
+        self.assertEqual('4', rows[1][table.index('v4', 'uni')])
+        self.assertRaises(KeyError, table.index, 'v4', 'bad')
+        self.assertEqual([], list(Table('', headers=2)))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+from unittest.mock import patch
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import TestFreeRTRModule
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import set_module_args
+from ansible_collections.sense.freertr.plugins.modules import freertr_command
+
+
+class TestFreeRTRCommand(TestFreeRTRModule):
+
+    module = freertr_command
+
+    def setUp(self):
+        super(TestFreeRTRCommand, self).setUp()
+
+        self.mock_run_commands = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_command.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+        self.sent = []
+
+    def tearDown(self):
+        super(TestFreeRTRCommand, self).tearDown()
+
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+
+        def reply(module, commands):
+            # bgp is established on third poll, lldp on first
+            out = []
+            for cmd in commands:
+                self.sent.append(cmd['command'])
+                if cmd['command'] == 'show bgp':
+                    out.append('established' if self.sent.count('show bgp') >= 3 else 'idle')
+                else:
+                    out.append('neighbor sdn1')
+            return out
+
+        self.run_commands.side_effect = reply
+
+    def test_poll_only_unmet(self):
+        set_module_args({'commands': ['show bgp', 'show lldp'],
+                         'wait_for': ['result[0] contains established', 'result[1] contains sdn1']})
+        result = self.execute_module()
+        self.assertEqual(['show bgp', 'show lldp', 'show bgp', 'show bgp'], self.sent)
+        self.assertEqual({'result[0] contains established': 3, 'result[1] contains sdn1': 1}, result['polls'])
+        self.assertEqual(['established', 'neighbor sdn1'], result['stdout'])
+
+    def test_retries_exhausted(self):
+        set_module_args({'commands': ['show bgp', 'show lldp'], 'retries': 2,
+                         'wait_for': ['result[0] contains established']})
+        result = self.execute_module(failed=True)
+        self.assertEqual(['result[0] contains established'], result['failed_conditions'])
+        self.assertEqual({'result[0] contains established': 2}, result['polls'])
+
+    def test_deadline(self):
+        set_module_args({'commands': ['show bgp'], 'interval': 5, 'deadline': 1,
+                         'wait_for': ['result[0] contains established']})
+        self.execute_module(failed=True)
+        self.assertEqual(['show bgp'], self.sent)
+
+    def test_backoff(self):
+        delays = freertr_command.pollDelays(1, 2, 0, maxInterval=5)
+        self.assertEqual([1, 2, 4, 5, 5], [next(delays) for _ in range(5)])
+        delays = freertr_command.pollDelays(10, 1, 0.5)
+        self.assertTrue(all(5 <= next(delays) <= 15 for _ in range(20)))
+
+    def test_filters(self):
+        set_module_args({'commands': ['show bgp', 'clear counters', 'show lldp | exclude x'],
+                         'filters': {'include': 'sdn'}})
+        self.execute_module()
+        self.assertEqual(['show bgp | include sdn', 'clear counters', 'show lldp | exclude x'], self.sent)
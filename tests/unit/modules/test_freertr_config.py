@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+from unittest.mock import patch, MagicMock, ANY
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import TestFreeRTRModule, load_fixture
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import set_module_args
+from ansible_collections.sense.freertr.plugins.modules import freertr_config
+from ansible_collections.sense.freertr.plugins.cliconf.freertr import Cliconf
+from ansible_collections.sense.freertr.plugins.module_utils.network.config import FreeRTRConfig, digest
+
+SRC = 'interface ethernet1\n description out of band management port\n exit\n'
+
+
+class TestFreeRTRConfig(TestFreeRTRModule):
+
+    module = freertr_config
+
+    def setUp(self):
+        super(TestFreeRTRConfig, self).setUp()
+
+        self.running = load_fixture('show_running-config')
+        self.known = None
+        self.mock_get_config = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_config.get_config')
+        self.get_config = self.mock_get_config.start()
+        self.get_config.side_effect = lambda module: self.running
+        self.mock_get_config_digests = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_config.get_config_digests')
+        self.get_config_digests = self.mock_get_config_digests.start()
+        self.get_config_digests.side_effect = lambda module: self.known
+        self.mock_set_config_digests = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_config.set_config_digests')
+        self.set_config_digests = self.mock_set_config_digests.start()
+        self.mock_load_config = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_config.load_config')
+        self.load_config = self.mock_load_config.start()
+
+    def tearDown(self):
+        super(TestFreeRTRConfig, self).tearDown()
+
+        self.mock_get_config.stop()
+        self.mock_get_config_digests.stop()
+        self.mock_set_config_digests.stop()
+        self.mock_load_config.stop()
+
+    @staticmethod
+    def blocks(src):
+        return FreeRTRConfig(src).digests('line line')
+
+    def test_digest_remembered(self):
+        set_module_args({'src': SRC, 'digest': True})
+        self.execute_module()
+        self.get_config.assert_called_once()
+        self.set_config_digests.assert_called_once_with(ANY, digest(self.running), self.blocks(SRC))
+        self.load_config.assert_not_called()
+
+    def test_digest_unchanged(self):
+        self.known = {'running': digest(self.running), 'blocks': sorted(self.blocks(SRC))}
+        set_module_args({'src': SRC, 'digest': True})
+        result = self.execute_module()
+        self.assertEqual('unchanged', result['digest'])
+        self.get_config.assert_not_called()
+        self.load_config.assert_not_called()
+
+    def test_digest_changed(self):
+        src = 'interface ethernet1\n description changed\n exit\n'
+        self.known = {'running': digest(self.running), 'blocks': sorted(self.blocks(SRC))}
+        set_module_args({'src': src, 'digest': True})
+        result = self.execute_module(changed=True, commands=['interface ethernet1', 'description changed'],
+                                     sort=False)
+        self.assertNotIn('digest', result)
+        self.get_config.assert_called_once()
+        self.load_config.assert_called_once()
+        self.set_config_digests.assert_not_called()
+
+    def test_digest_disabled(self):
+        self.known = {'running': digest(self.running), 'blocks': sorted(self.blocks(SRC))}
+        set_module_args({'src': SRC})
+        self.assertNotIn('digest', self.execute_module())
+        self.get_config.assert_called_once()
+        self.get_config_digests.assert_not_called()
+
+
+class TestFreeRTRConfigConnectionCache(TestFreeRTRModule):
+    """freertr_config runs with module_utils and cliconf over a fake transport"""
+
+    module = freertr_config
+
+    def setUp(self):
+        super(TestFreeRTRConfigConnectionCache, self).setUp()
+
+        self.transport = MagicMock()
+        self.transport.send.side_effect = self.send
+        self.transport.get_prompt.return_value = b'rare#'
+        self.cliconf = Cliconf(self.transport)
+        self.mock_connection = patch(
+            'ansible_collections.sense.freertr.plugins.module_utils.network.freertr.Connection',
+            return_value=self.cliconf)
+        self.mock_connection.start()
+
+    def tearDown(self):
+        super(TestFreeRTRConfigConnectionCache, self).tearDown()
+
+        self.mock_connection.stop()
+
+    @staticmethod
+    def send(command, **kwargs):
+        command = command.decode()
+        if not command.startswith('show '):
+            return b''
+        return load_fixture(command.replace(' ', '_')).encode()
+
+    def sent(self):
+        return [call[1]['command'] for call in self.transport.send.call_args_list]
+
+    def test_running_config_cached(self):
+        args = {'src': 'hostname rare\n', '_ansible_socket': '/connection'}
+        for _ in range(3):
+            set_module_args(dict(args))
+            self.assertNotIn('updates', self.execute_module())
+        self.assertEqual(1, self.sent().count(b'show running-config'))
+        self.assertEqual({'hit': 2, 'miss': 1}, self.cliconf.get_config_stats())
+
+    def test_running_config_invalidated(self):
+        set_module_args({'src': 'hostname rare\n', '_ansible_socket': '/connection'})
+        self.execute_module()
+        set_module_args({'lines': ['hostname rare2'], '_ansible_socket': '/connection'})
+        self.execute_module(changed=True, commands=['hostname rare2'])
+        set_module_args({'src': 'hostname rare\n', '_ansible_socket': '/connection'})
+        self.execute_module()
+        self.assertEqual(2, self.sent().count(b'show running-config'))
+        self.assertEqual({'hit': 1, 'miss': 2}, self.cliconf.get_config_stats())
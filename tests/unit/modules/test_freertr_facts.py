@@ -2,12 +2,21 @@
 # -*- coding: utf-8 -*-
 __metaclass__ = type
 
+import os
+import gzip
 import json
+import shutil
+import tempfile
+import threading
+import time
 
 from unittest.mock import *
 from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import TestFreeRTRModule, load_fixture
 from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import set_module_args
 from ansible_collections.sense.freertr.plugins.modules import freertr_facts
+from ansible_collections.sense.freertr.plugins.module_utils.network.filters import splitPipe, apply
+from ansible_collections.sense.freertr.plugins.module_utils.network.routes import RouteTable
+from ansible_collections.sense.freertr.plugins.module_utils.network.cache import outputDigest
 
 
 class TestFreeRTRFacts(TestFreeRTRModule):
@@ -38,11 +47,10 @@ class TestFreeRTRFacts(TestFreeRTRModule):
                     command = obj['command']
                 except ValueError:
                     command = item
-                if '|' in command:
-                    command = str(command).replace('|', '')
+                command, pipe, regex = splitPipe(command)
                 filename = str(command).replace(' ', '_')
                 filename = filename.replace('/', '7')
-                output.append(load_fixture(filename))
+                output.append(apply(load_fixture(filename), pipe, regex))
             return output
 
         self.run_commands.side_effect = load_from_file
@@ -107,3 +115,384 @@ class TestFreeRTRFacts(TestFreeRTRModule):
         self.assertIn('ansible_net_routing', ansible_facts)
         self.assertIn("ipv4", ansible_facts['ansible_net_routing'])
         self.assertIn("ipv6", ansible_facts['ansible_net_routing'])
+
+    def test_freertr_facts_lldp_bulk_detail(self):
+        set_module_args({'gather_subset': 'interfaces'})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        lldpCalls = [call[0][1] for call in self.run_commands.call_args_list
+                     if any('lldp detail' in cmd for cmd in call[0][1])]
+        self.assertEqual(1, len(lldpCalls))
+        self.assertEqual(['show lldp detail sdn12000', 'show lldp detail sdn12004',
+                          'show lldp detail sdn13000'], lldpCalls[0])
+        self.assertEqual("b8:59:9f:ed:22:52", ansible_facts['ansible_net_lldp']['sdn12004']['remote_chassis_id'])
+        self.assertEqual("b8:59:9f:ed:2a:02", ansible_facts['ansible_net_lldp']['sdn13000']['remote_chassis_id'])
+
+    def test_freertr_facts_routing_skip_empty_vrfs(self):
+        set_module_args({'gather_subset': 'routing'})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertIn('show ipv4 route lin', sent)
+        self.assertIn('show ipv4 route oob', sent)
+        self.assertIn('show ipv6 route oob', sent)
+        self.assertNotIn('show ipv6 route lin', sent)
+        self.assertNotIn('show ipv4 route p4', sent)
+        self.assertNotIn('show ipv6 route p4', sent)
+        vrfs = ansible_facts['ansible_net_vrfs']
+        self.assertEqual({'lin', 'oob', 'p4'}, set(vrfs))
+        self.assertEqual('0:0', vrfs['oob']['rd'])
+        self.assertEqual({'v4': 4, 'v6': 2}, vrfs['oob']['uni'])
+        self.assertEqual({'v4': 0, 'v6': 0}, vrfs['p4']['uni'])
+        self.assertEqual(6, len(ansible_facts['ansible_net_ipv4']))
+        self.assertEqual(2, len(ansible_facts['ansible_net_ipv6']))
+
+    def test_freertr_facts_routing_drops_route_text(self):
+        module = MagicMock()
+        module.params = {}
+        inst = freertr_facts.Routing(module)
+        inst.replies = {'show vrf routing': load_fixture('show_vrf_routing')}
+        inst.replies.update((cmd, load_fixture(cmd.replace(' ', '_'))) for cmd in
+                            ['show ipv4 route lin', 'show ipv4 route oob', 'show ipv6 route oob'])
+        digest = outputDigest([inst.replies[cmd] for cmd in ['show vrf routing', 'show ipv4 route lin',
+                                                                          'show ipv4 route oob', 'show ipv6 route oob']])
+        inst.populate()
+        self.assertEqual(['show vrf routing'], list(inst.replies))
+        self.assertEqual(6, len(inst.facts['ipv4']))
+        self.assertEqual(digest, inst.digest.hexdigest())
+
+    def test_freertr_facts_routing_filters(self):
+        set_module_args({'gather_subset': 'routing', 'routing_exclude_vrfs': ['lin'],
+                         'routing_types': ['C', 'REM'], 'routing_prefixes': ['172.16.0.0/16', 'fe80::/10']})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertNotIn('show ipv4 route lin', sent)
+        self.assertEqual([{'vrf': 'oob', 'intf': 'ethernet1', 'from': '172.16.0.0/23'},
+                          {'vrf': 'oob', 'intf': 'ethernet1', 'from': '172.16.1.35/32', 'to': '172.16.1.35'}],
+                         ansible_facts['ansible_net_ipv4'])
+        self.assertEqual(['fe80::/64'], [route['from'] for route in ansible_facts['ansible_net_ipv6']])
+        self.assertEqual({'total': 2, 'types': {'C': 1, 'REM': 1}},
+                         ansible_facts['ansible_net_route_summary']['oob']['ipv4'])
+
+    def test_freertr_facts_routing_summary(self):
+        set_module_args({'gather_subset': 'routing', 'routing_vrfs': ['oob'], 'routing_summary': True})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        self.assertNotIn('ansible_net_ipv4', ansible_facts)
+        self.assertEqual({'oob'}, set(ansible_facts['ansible_net_route_summary']))
+        self.assertEqual({'total': 4, 'types': {'DEF': 1, 'C': 1, 'REM': 1, 'LOC': 1}},
+                         ansible_facts['ansible_net_route_summary']['oob']['ipv4'])
+        self.assertEqual(2, ansible_facts['ansible_net_route_summary']['oob']['ipv6']['total'])
+
+    def test_freertr_facts_interfaces_tokenizer(self):
+        data = load_fixture('show_interfaces') + '\n'.join([
+            '',
+            'sdn7.100 is up',
+            ' description: legacy format',
+            ' type is sdn, hwaddr=0015.180b.6038, mtu=1496, bw=8000kbps, vrf=CORE',
+            ' ipv4 address is 10.8.14.2/24 ifcid=684917826',
+            ' received 10 packets (1000 bytes) dropped 1 packets (100 bytes)',
+            ' transmitted 20 packets (2000 bytes) macsec=false sgt=false'])
+        parsed = freertr_facts.Interfaces(None).parseInterfaces(data)
+        self.assertEqual({'operstatus': 'up', 'description': 'legacy format', 'type': 'sdn',
+                          'macaddress': '00:15:18:0b:60:38', 'mtu': 1496, 'bandwidth': 0, 'vrf': 'CORE',
+                          'ipv4': '10.8.14.2/24',
+                          'counters': {'rx_packets': 10, 'rx_bytes': 1000, 'rx_drop_packets': 1,
+                                       'rx_drop_bytes': 100, 'tx_packets': 20, 'tx_bytes': 2000}},
+                         parsed['sdn7.100'])
+        self.assertEqual('out of band management port', parsed['ethernet1']['description'])
+        self.assertEqual('fe80::201:bff:fead:c0de/64', parsed['ethernet1']['ipv6'])
+        self.assertEqual('00:1d:13:58:57:3b', parsed['sdn11002']['macaddress'])
+        self.assertEqual(1535121, parsed['ethernet1']['counters']['rx_packets'])
+        self.assertNotIn('rare#terminal', parsed)
+
+    def test_freertr_facts_counters(self):
+        stateDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, stateDir)
+        set_module_args({'gather_subset': 'counters', 'state_dir': stateDir})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        self.assertEqual({'rx_packets': 1535121, 'rx_bytes': 200401050, 'rx_drop_packets': 1181718,
+                          'rx_drop_bytes': 66067611, 'tx_packets': 45682, 'tx_bytes': 2406930},
+                         ansible_facts['ansible_net_counters']['ethernet1'])
+        self.assertNotIn('ansible_net_counters_delta', ansible_facts)
+        self.assertEqual(['rare_accton_as9516_32d.counters.json'], os.listdir(stateDir))
+
+        fname = os.path.join(stateDir, 'rare_accton_as9516_32d.counters.json')
+        with open(fname, 'r', encoding='utf-8') as fd:
+            state = json.load(fd)
+        state['timestamp'] -= 10
+        state['interfaces']['ethernet1']['rx_bytes'] -= 1000
+        state['interfaces']['ethernet1']['tx_packets'] += 5
+        with open(fname, 'w', encoding='utf-8') as fd:
+            json.dump(state, fd)
+        set_module_args({'gather_subset': 'counters', 'state_dir': stateDir})
+        result = self.execute_module()
+        ansible_facts = result['ansible_facts']
+        delta = ansible_facts['ansible_net_counters_delta']
+        self.assertAlmostEqual(10, delta['interval'], delta=1)
+        self.assertEqual(1000, delta['interfaces']['ethernet1']['rx_bytes'])
+        self.assertEqual(0, delta['interfaces']['ethernet1']['rx_packets'])
+        self.assertEqual(45682, delta['interfaces']['ethernet1']['tx_packets'])
+        self.assertAlmostEqual(100, ansible_facts['ansible_net_counters_rate']['ethernet1']['rx_bytes'], delta=10)
+
+    def test_freertr_facts_cache(self):
+        stateDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, stateDir)
+        args = {'gather_subset': 'routing', 'state_dir': stateDir, 'cache_ttl': 600}
+        set_module_args(dict(args))
+        first = self.execute_module()['ansible_facts']
+        self.assertEqual({'fresh': 0, 'revalidated': 0, 'miss': 1, 'evicted': 0}, first['ansible_net_cache'])
+
+        self.run_commands.reset_mock()
+        set_module_args(dict(args))
+        second = self.execute_module()['ansible_facts']
+        self.assertEqual(1, second['ansible_net_cache']['fresh'])
+        self.assertEqual([call(ANY, ['show platform'], check_rc=False, memoize=True)], self.run_commands.call_args_list)
+        self.assertEqual(first['ansible_net_ipv4'], second['ansible_net_ipv4'])
+
+        # Expired entry is revalidated with one batch of same commands and not parsed again
+        fname = os.path.join(stateDir, 'rare_accton_as9516_32d.cache.json')
+        with open(fname, 'r', encoding='utf-8') as fd:
+            state = json.load(fd)
+        for entry in state['entries'].values():
+            entry['created'] -= 3600
+        with open(fname, 'w', encoding='utf-8') as fd:
+            json.dump(state, fd)
+        self.run_commands.reset_mock()
+        set_module_args(dict(args))
+        with patch.object(freertr_facts.Routing, 'parseVrfTable') as parseVrfTable:
+            third = self.execute_module()['ansible_facts']
+            parseVrfTable.assert_not_called()
+        self.assertEqual(1, third['ansible_net_cache']['revalidated'])
+        self.assertEqual(2, self.run_commands.call_count)
+        self.assertEqual(['show vrf routing', 'show ipv4 route lin', 'show ipv4 route oob', 'show ipv6 route oob'],
+                         self.run_commands.call_args_list[1][0][1])
+        self.assertEqual(first['ansible_net_vrfs'], third['ansible_net_vrfs'])
+
+        # Size bound evicts least recently used entries
+        set_module_args(dict(args, routing_summary=True, cache_size=1))
+        fourth = self.execute_module()['ansible_facts']
+        self.assertEqual(1, fourth['ansible_net_cache']['evicted'])
+
+    def test_freertr_facts_cache_pipeline(self):
+        stateDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, stateDir)
+        threads = set()
+        self.load_fixtures()
+        loadFromFile = self.run_commands.side_effect
+
+        def fetch(module, commands, **kwargs):
+            threads.add(threading.current_thread().name)
+            return loadFromFile(module, commands, **kwargs)
+
+        self.run_commands.side_effect = fetch
+        args = {'gather_subset': ['interfaces', 'routing'], 'state_dir': stateDir, 'cache_ttl': 600, 'pipeline': True}
+        set_module_args(dict(args))
+        first = self.changed()['ansible_facts']
+        self.assertEqual(2, first['ansible_net_cache']['miss'])
+
+        # Expired entries are revalidated, digest of changed output misses and is parsed again
+        fname = os.path.join(stateDir, 'rare_accton_as9516_32d.cache.json')
+        with open(fname, 'r', encoding='utf-8') as fd:
+            state = json.load(fd)
+        for key, entry in state['entries'].items():
+            entry['created'] -= 3600
+            if key.startswith('routing:'):
+                entry['digest'] = 'changed'
+        with open(fname, 'w', encoding='utf-8') as fd:
+            json.dump(state, fd)
+        set_module_args(dict(args))
+        second = self.changed()['ansible_facts']
+        self.assertEqual({'fresh': 0, 'revalidated': 1, 'miss': 1, 'evicted': 0}, second['ansible_net_cache'])
+        self.assertEqual(first['ansible_net_ipv4'], second['ansible_net_ipv4'])
+        self.assertEqual(first['ansible_net_interfaces'], second['ansible_net_interfaces'])
+        self.assertEqual({threading.current_thread().name}, threads)
+
+    def test_freertr_facts_differential(self):
+        stateDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, stateDir)
+        args = {'gather_subset': ['interfaces', 'routing'], 'state_dir': stateDir, 'differential': True}
+        set_module_args(dict(args))
+        first = self.execute_module()['ansible_facts']
+        self.assertNotIn('ansible_net_interfaces', first)
+        self.assertNotIn('ansible_net_ipv4', first)
+        changes = first['ansible_net_changes']
+        self.assertEqual((0, 1), (changes['previous_generation'], changes['generation']))
+        self.assertIn('ethernet1', changes['interfaces']['added'])
+        self.assertEqual(6, len(changes['ipv4']['added']))
+        self.assertIn('sdn12000', changes['lldp']['added'])
+
+        set_module_args(dict(args))
+        second = self.execute_module()['ansible_facts']['ansible_net_changes']
+        self.assertEqual(1, second['generation'])
+        for key in ['interfaces', 'lldp', 'ipv4', 'ipv6']:
+            self.assertEqual({'added': {}, 'removed': [], 'changed': {}} if key in ['interfaces', 'lldp']
+                             else {'added': [], 'removed': [], 'changed': []}, second[key])
+
+        fixtures = {'show_ipv4_route_oob': load_fixture('show_ipv4_route_oob').replace('172.16.1.35/32', '172.16.1.36/32'),
+                    'show_lldp_neighbor': '\n'.join(load_fixture('show_lldp_neighbor').split('\n')[:3])}
+        loader = self.run_commands.side_effect
+
+        def changed_fixtures(module, commands, **kwargs):
+            output = loader(module, commands)
+            return [fixtures.get(cmd.replace(' ', '_'), out) for cmd, out in zip(commands, output)]
+        self.run_commands.side_effect = changed_fixtures
+        set_module_args(dict(args))
+        third = self.changed()['ansible_facts']['ansible_net_changes']
+        self.assertEqual((1, 2), (third['previous_generation'], third['generation']))
+        self.assertEqual(['172.16.1.36/32'], [route['from'] for route in third['ipv4']['added']])
+        self.assertEqual(['172.16.1.35/32'], [route['from'] for route in third['ipv4']['removed']])
+        self.assertEqual(['sdn13000'], third['lldp']['removed'])
+        self.assertEqual({}, third['interfaces']['changed'])
+
+    def test_freertr_facts_pipeline(self):
+        args = {'gather_subset': ['interfaces', 'routing', 'config'], 'routing_prefixes': ['172.16.0.0/12']}
+        set_module_args(dict(args))
+        sequential = self.execute_module()['ansible_facts']
+        set_module_args(dict(args, pipeline=True))
+        pipelined = self.execute_module()['ansible_facts']
+        for key in ['ansible_net_interfaces', 'ansible_net_lldp', 'ansible_net_ipv4', 'ansible_net_vrfs',
+                    'ansible_net_config', 'ansible_net_hostname']:
+            self.assertEqual(sequential[key], pipelined[key])
+
+        set_module_args(dict(args, pipeline=True, routing_prefixes=['bad/prefix']))
+        result = self.execute_module(failed=True)
+        self.assertIn('routing_prefixes', result['msg'])
+
+    def test_freertr_facts_pipeline_overlap(self):
+        spans = {'fetch': [], 'parse': []}
+        self.load_fixtures()
+        loadFromFile = self.run_commands.side_effect
+
+        def slowFetch(module, commands, **kwargs):
+            start = time.time()
+            threading.Event().wait(0.05)
+            out = loadFromFile(module, commands, **kwargs)
+            if any(' route ' in cmd for cmd in commands):
+                spans['fetch'].append((start, time.time()))
+            return out
+
+        class SlowTable(RouteTable):
+            def parse(self, data):
+                start = time.time()
+                threading.Event().wait(0.05)
+                out = super(SlowTable, self).parse(data)
+                spans['parse'].append((start, time.time()))
+                return out
+
+        self.run_commands.side_effect = slowFetch
+        set_module_args({'gather_subset': ['routing', 'interfaces'], 'pipeline': True})
+        with patch('ansible_collections.sense.freertr.plugins.modules.freertr_facts.RouteTable', SlowTable):
+            result = self.changed()
+        self.assertEqual(3, len(spans['fetch']))
+        self.assertEqual(3, len(spans['parse']))
+        # Route table of a vrf is parsed while route table of next vrf is fetched
+        self.assertTrue(any(pstart < fend and fstart < pend for pstart, pend in spans['parse']
+                            for fstart, fend in spans['fetch']), spans)
+        self.assertEqual(['lin', 'lin', 'oob', 'oob', 'oob', 'oob'],
+                         [route['vrf'] for route in result['ansible_facts']['ansible_net_ipv4']])
+        # Subsets run in fixed order
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertLess(sent.index('show interfaces'), sent.index('show vrf routing'))
+
+    def test_freertr_facts_pushdown(self):
+        args = {'gather_subset': ['interfaces', 'routing'], 'routing_types': ['C', 'REM']}
+        set_module_args(dict(args))
+        full = self.execute_module()['ansible_facts']
+        self.run_commands.reset_mock()
+        set_module_args(dict(args, pushdown=True))
+        filtered = self.execute_module()['ansible_facts']
+        for key in ['ansible_net_interfaces', 'ansible_net_lldp', 'ansible_net_ipv4', 'ansible_net_ipv6',
+                    'ansible_net_route_summary']:
+            self.assertEqual(full[key], filtered[key])
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertIn('show ipv4 route oob | include ^(typ|C|REM)\\s', sent)
+        self.assertIn(r'show interfaces | include ^\S|^ (description|type|ipv4 address|ipv6 address)', sent)
+
+    def test_freertr_facts_pushdown_shared_interfaces(self):
+        args = {'gather_subset': ['interfaces', 'counters']}
+        set_module_args(dict(args))
+        full = self.execute_module()['ansible_facts']
+        self.run_commands.reset_mock()
+        set_module_args(dict(args, pushdown=True))
+        filtered = self.execute_module()['ansible_facts']
+        for key in ['ansible_net_interfaces', 'ansible_net_counters']:
+            self.assertEqual(full[key], filtered[key])
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        interfacesCmds = set(cmd for cmd in sent if cmd.startswith('show interfaces'))
+        self.assertEqual(1, len(interfacesCmds))
+        self.assertIn('received|transmitted', interfacesCmds.pop())
+
+    def test_freertr_facts_interfaces_selection(self):
+        set_module_args({'gather_subset': 'interfaces', 'interfaces_include': ['sdn*', 're:ethernet[12]$'],
+                         'interfaces_exclude': ['sdn12004', 're:sdn1\\d$'],
+                         'interfaces_fields': ['operstatus', 'ipv4']})
+        ansible_facts = self.execute_module()['ansible_facts']
+        interfaces = ansible_facts['ansible_net_interfaces']
+        self.assertNotIn('ethernet0', interfaces)
+        self.assertNotIn('sdn12004', interfaces)
+        self.assertNotIn('sdn15', interfaces)
+        self.assertEqual({'operstatus': 'up', 'ipv4': [{'address': '172.16.1.225', 'masklen': 23}]},
+                         interfaces['ethernet1'])
+        self.assertEqual({'operstatus': 'up'}, interfaces['sdn12000'])
+        self.assertEqual(['sdn12000', 'sdn13000'], sorted(ansible_facts['ansible_net_lldp']))
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertNotIn('show ipv6 interface', sent)
+        self.assertNotIn('show lldp detail sdn12004', sent)
+
+        set_module_args({'gather_subset': 'interfaces', 'interfaces_include': ['re:(']})
+        self.assertIn('interfaces_include', self.execute_module(failed=True)['msg'])
+
+    def test_freertr_facts_interfaces_fields_without_operstatus(self):
+        set_module_args({'gather_subset': 'interfaces', 'interfaces_fields': ['description']})
+        ansible_facts = self.execute_module()['ansible_facts']
+        self.assertEqual({'description': 'out of band management port'},
+                         ansible_facts['ansible_net_interfaces']['ethernet1'])
+        self.assertIn('sdn12000', ansible_facts['ansible_net_lldp'])
+
+        self.run_commands.reset_mock()
+        set_module_args({'gather_subset': 'interfaces', 'interfaces_fields': ['ipv4', 'mtu']})
+        interfaces = self.execute_module()['ansible_facts']['ansible_net_interfaces']
+        self.assertEqual({'mtu': 1500, 'ipv4': [{'address': '172.16.1.225', 'masklen': 23}]},
+                         interfaces['ethernet1'])
+        sent = [cmd for call in self.run_commands.call_args_list for cmd in call[0][1]]
+        self.assertIn('show interfaces', sent)
+        self.assertIn('show lldp neighbor', sent)
+        self.assertNotIn('show ipv6 interface', sent)
+
+    def test_freertr_facts_interfaces_indexes(self):
+        set_module_args({'gather_subset': 'interfaces', 'interfaces_indexes': True})
+        indexes = self.execute_module()['ansible_facts']['ansible_net_indexes']
+        self.assertEqual(['ethernet0', 'ethernet2'], indexes['mac']['00:00:0b:ad:c0:de'])
+        self.assertEqual('ethernet1', indexes['ip']['172.16.1.225'])
+        self.assertEqual(['sdn12000'], indexes['chassis']['b8:59:9f:ed:29:8e'])
+
+        module = MagicMock()
+        module.params = {'interfaces_indexes': True}
+        inst = freertr_facts.Interfaces(module)
+        inst.replies = dict((cmd, load_fixture(cmd.replace(' ', '_'))) for cmd in inst.COMMANDS)
+        inst.replies['show interfaces'] += 'sdn12000.100 is up\n type is sdn hwaddr is 0073.3204.2b5e\n'
+        inst.replies.update(('show lldp detail %s' % intf, load_fixture('show_lldp_detail_%s' % intf))
+                            for intf in ['sdn12000', 'sdn12004', 'sdn13000'])
+        inst.populate()
+        self.assertEqual(['sdn12000.100'], inst.facts['indexes']['parent']['sdn12000'])
+        self.assertEqual(['sdn10', 'sdn12000.100'], inst.facts['indexes']['mac']['00:73:32:04:2b:5e'])
+        self.assertEqual(len(set(inst.facts['info']['macs'])), len(inst.facts['info']['macs']))
+
+    def test_freertr_facts_export(self):
+        exportDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, exportDir)
+        set_module_args({'gather_subset': 'routing', 'export_dir': exportDir, 'export_compress': True})
+        ansible_facts = self.execute_module()['ansible_facts']
+        self.assertNotIn('ansible_net_ipv4', ansible_facts)
+        self.assertNotIn('ansible_net_ipv6', ansible_facts)
+        manifest = ansible_facts['ansible_net_export']
+        self.assertEqual({'ipv4', 'ipv6'}, set(manifest))
+        self.assertEqual(6, manifest['ipv4']['records'])
+        self.assertEqual(2, manifest['ipv6']['records'])
+        with gzip.open(manifest['ipv4']['path'], 'rt', encoding='utf-8') as fd:
+            routes = [json.loads(line) for line in fd]
+        self.assertEqual(6, len(routes))
+        self.assertIn('vrf', routes[0])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__metaclass__ = type
+
+from unittest.mock import patch
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import TestFreeRTRModule, load_fixture
+from ansible_collections.sense.freertr.tests.unit.modules.freertr_module import set_module_args
+from ansible_collections.sense.freertr.plugins.modules import freertr_route_lookup
+
+
+class TestFreeRTRRouteLookup(TestFreeRTRModule):
+
+    module = freertr_route_lookup
+
+    def setUp(self):
+        super(TestFreeRTRRouteLookup, self).setUp()
+
+        self.mock_run_commands = patch(
+            'ansible_collections.sense.freertr.plugins.modules.freertr_route_lookup.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+
+    def tearDown(self):
+        super(TestFreeRTRRouteLookup, self).tearDown()
+
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+
+        def load_from_file(module, commands):
+            return [load_fixture(command.replace(' ', '_')) for command in commands]
+
+        self.run_commands.side_effect = load_from_file
+
+    def test_lookup(self):
+        set_module_args({'vrf': 'oob', 'destinations': ['172.16.1.35', '172.16.0.0/24', '8.8.8.8']})
+        result = self.execute_module()
+        self.assertEqual(['172.16.1.35/32', '172.16.0.0/23', '0.0.0.0/0'],
+                         [item['prefix'] for item in result['lookups']])
+        self.assertEqual({'destination': '172.16.1.35', 'vrf': 'oob', 'found': True, 'prefix': '172.16.1.35/32',
+                          'type': 'REM', 'iface': 'ethernet1', 'distance': 0, 'metric': 0, 'hop': '172.16.1.35'},
+                         result['lookups'][0])
+        self.assertNotIn('hop', result['lookups'][1])
+        self.assertEqual({'ipv4': 4}, result['routes'])
+        self.run_commands.assert_called_once()
+
+    def test_lookup_ipv6_and_missing(self):
+        set_module_args({'vrf': 'oob', 'destinations': ['2001:db8::1', '172.16.1.36']})
+        result = self.execute_module()
+        self.assertFalse(result['lookups'][0]['found'])
+        self.assertEqual('172.16.0.0/23', result['lookups'][1]['prefix'])
+        set_module_args({'vrf': 'oob', 'destinations': ['bad']})
+        self.assertIn('Bad destination', self.execute_module(failed=True)['msg'])